@@ -6,6 +6,9 @@
 #              Don't modify the contents of this file.
 
 
+import sys
+
+
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
 class DynamicArrayException(Exception):
@@ -16,26 +19,45 @@ class DynamicArray:
     """
     Class implementing a Dynamic Array
     Supported methods are:
-    append, pop, swap, get_at_index, set_at_index, length
+    append, pop, swap, get_at_index, set_at_index, length,
+    get_unchecked, set_unchecked, fill, with_capacity, iterator
     """
 
+    __slots__ = ('_data',)
+
     def __init__(self, arr=None) -> None:
         """Initialize new dynamic array using a list."""
         self._data = arr.copy() if arr else []
 
+    @classmethod
+    def fill(cls, length: int, value: object) -> "DynamicArray":
+        """Return a new array with length elements, all set to value."""
+        da = cls()
+        da._data = [value] * length
+        return da
+
+    @classmethod
+    def with_capacity(cls, capacity: int) -> "DynamicArray":
+        """
+        Return a new array with capacity empty (None) elements,
+        such as the buckets of a hash table.
+        """
+        return cls.fill(capacity, None)
+
     def __iter__(self):
         """
-        Disable iterator capability for DynamicArray class
-        This means loops and aggregate functions like
-        those shown below won't work:
+        Return an iterator over the elements, in order, so loops and
+        aggregate functions work:
 
         da = DynamicArray()
-        for value in da:        # will not work
-        min(da)                 # will not work
-        max(da)                 # will not work
-        sort(da)                # will not work
+        for value in da:
+        min(da)
+        max(da)
+        sorted(da)
+
+        The iterator reads the underlying list directly; nothing is copied.
         """
-        return None
+        return iter(self._data)
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -73,10 +95,33 @@ class DynamicArray:
         """Set value of element at a given index using [] syntax."""
         self.set_at_index(index, value)
 
+    def get_unchecked(self, index: int):
+        """
+        Return value of element at a given index without checking the
+        index. For internal hot loops where the index is already known to
+        be valid (such as a hash table index taken modulo its capacity):
+        it skips the length() call and bounds checks of get_at_index.
+        """
+        return self._data[index]
+
+    def set_unchecked(self, index: int, value: object) -> None:
+        """
+        Set value of element at a given index without checking the index.
+        The counterpart of get_unchecked.
+        """
+        self._data[index] = value
+
     def length(self) -> int:
         """Return length of array."""
         return len(self._data)
 
+    def sizeof(self) -> int:
+        """
+        Return the bytes used by the array and its storage,
+        not counting the elements stored in it.
+        """
+        return sys.getsizeof(self) + sys.getsizeof(self._data)
+
 
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
@@ -96,6 +141,47 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+def to_list(items) -> list:
+    """
+    Return the elements of a DynamicArray, or of any other iterable, as a
+    new list. Used by the batch methods of both hash maps.
+    """
+    if isinstance(items, DynamicArray):
+        return items._data.copy()
+    return list(items)
+
+
+def deep_sizeof(obj: object, seen: set) -> int:
+    """
+    Return the size in bytes of an object and everything it refers to
+    (container items, and __dict__ or __slots__ attributes), counting
+    each object only once. The ids of counted objects are added to seen,
+    so one set can be shared across calls to avoid double counting.
+    """
+    if obj is None or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)):
+        return size
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+
+    if hasattr(obj, '__dict__'):
+        size += deep_sizeof(obj.__dict__, seen)
+    for name in getattr(type(obj), '__slots__', ()):
+        size += deep_sizeof(getattr(obj, name, None), seen)
+
+    return size
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -103,11 +189,19 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        The full (un-modded) hash of the key is cached so the table can
+        be resized without calling the hash function again.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -119,6 +213,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -141,9 +237,11 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, remove, pop, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,35 +266,48 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        If the key's hash is given, it's compared before the key itself.
         Return True if removal was successful, False otherwise.
         """
+        return self.pop(key, hash) is not None
+
+    def pop(self, key: str, hash: int = None) -> SLNode:
+        """
+        Remove first node with matching key and return it, or None if no
+        match. If the key's hash is given, it's compared before the key
+        itself.
+        """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
                     self._head = node.next
                 self._size -= 1
-                return True
+                node.next = None
+                return node
 
             previous, node = node, node.next
-        return False
+        return None
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If the key's hash is given, it's compared before the key itself.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
@@ -210,11 +321,25 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    __slots__ = ('key', 'value', 'is_tombstone', 'hash', 'step_hash', 'distance')
+
+    def __init__(self, key: str, value: object, hash: int = None,
+                 step_hash: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        The full (un-modded) hash of the key is cached so the table can
+        be resized without calling the hash function again, as is the
+        key's second hash (the step size for double hashing, or the
+        second table's hash for cuckoo hashing).
+        distance is the entry's probe distance from its home bucket,
+        used by Robin Hood probing.
+        """
         self.key = key
         self.value = value
         self.is_tombstone = False
+        self.hash = hash
+        self.step_hash = step_hash
+        self.distance = 0
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -0,0 +1,48 @@
+# Description:  Compares put / get / remove called in a Python loop with
+#   the batch put_many / get_many / remove_many methods on both hash maps.
+#
+#   Usage: python benchmarks/bench_batch.py [entry count, default 200K]
+#
+#   Each map starts at capacity 50, as in the __main__ examples, so the
+#   loop of puts resizes several times while put_many resizes once.
+#   Python's built-in hash is used so the timings reflect the per-call
+#   overhead and not the long chains of the sum-of-ords sample hash
+#   functions.
+
+
+from bench_utils import arg_count, make_keys, timed
+
+import hash_map_oa
+import hash_map_sc
+
+
+def single(m, keys: list) -> dict:
+    results = {}
+    results['put'] = timed(lambda: [m.put(key, key) for key in keys])
+    results['get'] = timed(lambda: [m.get(key) for key in keys])
+    results['remove'] = timed(lambda: [m.remove(key) for key in keys])
+    return results
+
+
+def batch(m, keys: list) -> dict:
+    results = {}
+    results['put'] = timed(m.put_many, keys, keys)
+    results['get'] = timed(m.get_many, keys)
+    results['remove'] = timed(m.remove_many, keys)
+    return results
+
+
+if __name__ == "__main__":
+
+    count = arg_count(200000)
+    keys = make_keys(count)
+
+    for module in (hash_map_sc, hash_map_oa):
+        loop = single(module.HashMap(50, hash), keys)
+        many = batch(module.HashMap(50, hash), keys)
+
+        print(f"\n{module.__name__} with {count} keys")
+        for name in loop:
+            print(f"{name:>8}: loop {loop[name]:8.3f} s   "
+                  f"batch {many[name]:8.3f} s   "
+                  f"{loop[name] / many[name]:5.2f}x")
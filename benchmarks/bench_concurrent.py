@@ -0,0 +1,71 @@
+# Description:  Contention benchmark for the lock-striped hash map in
+#   hash_map_concurrent. Threads run a random mix of get and put on a
+#   shared map, for several read ratios and thread counts, with 16 shards
+#   and with 1 shard (a single global lock) for comparison.
+#
+#   Usage: python benchmarks/bench_concurrent.py [operations per thread, default 100K]
+#
+#   With the GIL, threads don't run Python code in parallel, so this
+#   measures the cost of the locking and of threads waiting on each other,
+#   not a parallel speedup.
+
+
+import random
+import time
+from threading import Thread
+
+from bench_utils import arg_count, make_keys
+
+from hash_map_concurrent import HashMap
+
+
+KEY_COUNT = 10000
+
+
+def worker(m: HashMap, keys: list, operations: int, readRatio: float, seed: int) -> None:
+    rnd = random.Random(seed)
+    for _ in range(operations):
+        key = keys[rnd.randrange(KEY_COUNT)]
+        if rnd.random() < readRatio:
+            m.get(key)
+        else:
+            m.put(key, seed)
+
+
+def run(shards: int, threadCount: int, operations: int, readRatio: float,
+        keys: list) -> float:
+    """
+    - Returns the operations per second of threadCount threads sharing a
+        map with the given number of shards.
+    """
+
+    m = HashMap(KEY_COUNT, 'fnv1a', shards=shards)
+    for key in keys:
+        m.put(key, 0)
+
+    threads = [Thread(target=worker, args=(m, keys, operations, readRatio, seed))
+               for seed in range(threadCount)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    return threadCount * operations / seconds
+
+
+if __name__ == "__main__":
+
+    operations = arg_count(100000)
+    keys = make_keys(KEY_COUNT)
+
+    print(f"{operations} operations per thread, {KEY_COUNT} keys (operations/s)")
+    print(f"{'reads':>6} {'threads':>8} {'16 shards':>12} {'1 shard':>12}")
+
+    for readRatio in (0.5, 0.9, 0.99):
+        for threadCount in (1, 2, 4, 8):
+            striped = run(16, threadCount, operations, readRatio, keys)
+            single = run(1, threadCount, operations, readRatio, keys)
+            print(f"{readRatio:>6.0%} {threadCount:>8} {striped:12,.0f} {single:12,.0f}")
@@ -0,0 +1,63 @@
+# Description:  Compares reading the mode and the 10 most common keys from
+#   a live counter kept in CounterMap with doing the same from counts kept
+#   by put_mode in the chaining HashMap, which has to scan every key, as
+#   the counter grows.
+#
+#   Usage: python benchmarks/bench_counter.py [item count, default 1M]
+
+
+import random
+
+from bench_utils import arg_count, timed
+
+from hash_map_counter import CounterMap
+from hash_map_sc import HashMap
+
+
+POLLS = 100
+
+
+def scan_top(m: HashMap, k: int) -> list:
+    """
+    - The mode and top k from put_mode counts: every key is read.
+    """
+
+    keys = m.get_keys()
+    counts = [(m.get(keys[i]), keys[i]) for i in range(keys.length())]
+    counts.sort(reverse=True)
+    return counts[:k]
+
+
+def poll_counter(counter: CounterMap) -> None:
+    for _ in range(POLLS):
+        counter.mode()
+        counter.most_common(10)
+
+
+def poll_map(m: HashMap) -> None:
+    for _ in range(POLLS):
+        scan_top(m, 10)
+
+
+if __name__ == "__main__":
+
+    count = arg_count(1000000)
+    rnd = random.Random(261)
+    items = ['item' + str(int(rnd.paretovariate(0.3))) for _ in range(count)]
+
+    counter = CounterMap(64, 'fnv1a')
+    m = HashMap(64, 'fnv1a')
+
+    print(f"{'items':>10} {'distinct':>9}   {'increment':>10} {'put_mode':>10}   "
+          f"{'poll CounterMap':>15} {'poll put_mode':>14}")
+
+    step = count // 4
+    for start in range(0, count, step):
+        chunk = items[start:start + step]
+        incrementSeconds = timed(lambda: [counter.increment(item) for item in chunk])
+        putModeSeconds = timed(lambda: [m.put_mode(item) for item in chunk])
+
+        print(f"{start + len(chunk):>10} {counter.get_size():>9}   "
+              f"{incrementSeconds:9.3f}s {putModeSeconds:9.3f}s   "
+              f"{timed(poll_counter, counter) * 1e3 / POLLS:13.3f}ms "
+              f"{timed(poll_map, m) * 1e3 / POLLS:12.3f}ms")
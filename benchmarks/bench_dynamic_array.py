@@ -0,0 +1,118 @@
+# Description:  Micro-benchmark for the DynamicArray fast-access API.
+#   Times element access through [] / get_at_index / set_at_index against
+#   get_unchecked / set_unchecked, building a bucket array with an append
+#   loop against with_capacity, and then the per-operation cost of put,
+#   get, remove and resize_table on both hash maps when their buckets are
+#   a DynamicArray whose fast-access methods fall back to the checked ones.
+#
+#   Usage: python benchmarks/bench_dynamic_array.py [entry count, default 200K]
+
+
+from bench_utils import arg_count, make_keys, timed
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray
+
+
+class CheckedArray(DynamicArray):
+    """
+    - DynamicArray whose fast-access methods go through the checked ones,
+        which is how the hash maps accessed their buckets before.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def fill(cls, length: int, value: object) -> DynamicArray:
+        da = cls()
+        for _ in range(length):
+            da.append(value)
+        return da
+
+    def get_unchecked(self, index: int):
+        return self.get_at_index(index)
+
+    def set_unchecked(self, index: int, value: object) -> None:
+        self.set_at_index(index, value)
+
+
+def read_all(da: DynamicArray, count: int, rounds: int) -> None:
+    for _ in range(rounds):
+        for i in range(count):
+            da[i]
+
+
+def read_all_unchecked(da: DynamicArray, count: int, rounds: int) -> None:
+    getBucket = da.get_unchecked
+    for _ in range(rounds):
+        for i in range(count):
+            getBucket(i)
+
+
+def write_all(da: DynamicArray, count: int, rounds: int) -> None:
+    for _ in range(rounds):
+        for i in range(count):
+            da[i] = i
+
+
+def write_all_unchecked(da: DynamicArray, count: int, rounds: int) -> None:
+    setBucket = da.set_unchecked
+    for _ in range(rounds):
+        for i in range(count):
+            setBucket(i, i)
+
+
+def map_operations(module, function, keys: list) -> dict:
+    """
+    - Runs put, get and remove for every key, plus one resize_table, on a
+        new map from the given module.
+    - Returns the nanoseconds per operation for each.
+    """
+
+    m = module.HashMap(len(keys) * 3, function)
+    count = len(keys)
+    results = {}
+
+    results['put'] = timed(lambda: [m.put(key, key) for key in keys])
+    results['get'] = timed(lambda: [m.get(key) for key in keys])
+    results['resize'] = timed(m.resize_table, m.get_capacity() * 2)
+    results['remove'] = timed(lambda: [m.remove(key) for key in keys])
+
+    return {name: seconds * 1e9 / count for name, seconds in results.items()}
+
+
+def report(label: str, checked: float, unchecked: float) -> None:
+    print(f"{label:>24}: {checked:8.1f} ns  {unchecked:8.1f} ns  "
+          f"{(1 - unchecked / checked) * 100:6.1f}% saved")
+
+
+if __name__ == "__main__":
+
+    count = arg_count(200000)
+    rounds = 5
+    accesses = count * rounds
+
+    print(f"DynamicArray with {count} elements      checked  unchecked")
+
+    da = DynamicArray.with_capacity(count)
+    report("read", timed(read_all, da, count, rounds) * 1e9 / accesses,
+           timed(read_all_unchecked, da, count, rounds) * 1e9 / accesses)
+    report("write", timed(write_all, da, count, rounds) * 1e9 / accesses,
+           timed(write_all_unchecked, da, count, rounds) * 1e9 / accesses)
+    report("build (per slot)", timed(CheckedArray.fill, count, None) * 1e9 / count,
+           timed(DynamicArray.with_capacity, count) * 1e9 / count)
+
+    # Python's built-in hash keeps the chains and probe sequences short, so
+    # the bucket access is a larger share of each operation.
+    keys = make_keys(count)
+
+    for module in (hash_map_sc, hash_map_oa):
+        module.DynamicArray = CheckedArray
+        checked = map_operations(module, hash, keys)
+        module.DynamicArray = DynamicArray
+        unchecked = map_operations(module, hash, keys)
+
+        print(f"\n{module.__name__} with {count} entries")
+        for name in checked:
+            report(name + " (per entry)", checked[name], unchecked[name])
@@ -0,0 +1,61 @@
+# Description:  Compares find_mode, which needs the whole input in a
+#   DynamicArray and makes two more passes over the distinct keys, with
+#   find_mode_stream reading the same items from a generator in chunks.
+#   Reports the time and the peak memory traced while each one runs
+#   (including, for find_mode, building its input array).
+#
+#   Usage: python benchmarks/bench_find_mode.py [item count, default 1M]
+
+
+import random
+import tracemalloc
+
+from bench_utils import arg_count, timed
+
+from a6_include import DynamicArray
+from hash_map_sc import find_mode, find_mode_stream
+
+
+DISTINCT_KEYS = 2000
+
+
+def generate_items(count: int):
+    """
+    - Yields count keys drawn from DISTINCT_KEYS distinct values, with a
+        fixed seed so every run sees the same items.
+    """
+
+    rnd = random.Random(261)
+    for _ in range(count):
+        yield 'item' + str(rnd.randrange(DISTINCT_KEYS))
+
+
+def run_find_mode(count: int):
+    da = DynamicArray()
+    for item in generate_items(count):
+        da.append(item)
+    return find_mode(da)
+
+
+def run_find_mode_stream(count: int):
+    return find_mode_stream(generate_items(count))
+
+
+def peak_memory(function, *args) -> int:
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+
+    count = arg_count(1000000)
+    print(f"{count} items, {DISTINCT_KEYS} distinct keys")
+
+    for label, function in (("find_mode", run_find_mode),
+                            ("find_mode_stream", run_find_mode_stream)):
+        seconds = timed(function, count)
+        peak = peak_memory(function, count)
+        print(f"{label:>18}: {seconds:7.3f} s   peak {peak / 2 ** 20:8.2f} MiB")
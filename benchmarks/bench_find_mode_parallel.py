@@ -0,0 +1,44 @@
+# Description:  Times find_mode_parallel with 1, 2, 4 and 8 workers on
+#   the same items, reporting the speedup over one worker. The time the
+#   parent takes to split the items into slices is shown too, since that
+#   part doesn't scale with workers.
+#
+#   Usage: python benchmarks/bench_find_mode_parallel.py [item count, default 5M]
+#
+#   The speedup is limited by the number of CPU cores; it's printed
+#   first. The workers' maps use FNV-1a: with the sum-of-ords
+#   hash_function_1, nearly all the keys share a few long chains, and
+#   splitting those between shards speeds things up even on one core,
+#   which would hide the effect of the extra processes.
+
+
+import os
+import random
+
+from bench_utils import arg_count, timed
+
+from find_mode_parallel import find_mode_parallel, split
+from hash_functions import fnv1a
+
+
+DISTINCT_KEYS = 100000
+
+
+def make_items(count: int) -> list:
+    rnd = random.Random(261)
+    return ['item' + str(rnd.randrange(DISTINCT_KEYS)) for _ in range(count)]
+
+
+if __name__ == "__main__":
+
+    count = arg_count(5000000)
+    items = make_items(count)
+    print(f"{count} items, {DISTINCT_KEYS} distinct keys, {os.cpu_count()} CPU cores")
+
+    baseline = None
+    for workers in (1, 2, 4, 8):
+        seconds = timed(find_mode_parallel, items, workers, fnv1a)
+        splitting = timed(split, items, workers) if workers > 1 else 0.0
+        baseline = baseline or seconds
+        print(f"{workers} worker(s): {seconds:7.3f} s "
+              f"(split {splitting:6.3f} s)   {baseline / seconds:5.2f}x")
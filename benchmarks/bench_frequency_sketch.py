@@ -0,0 +1,94 @@
+# Description:  Compares exact mode counting (find_mode_stream, one node
+#   per distinct key) with the bounded-memory CountMinSketch and
+#   SpaceSaving summaries in frequency_sketch, on a skewed stream with a
+#   large number of distinct keys. Reports throughput, the peak memory
+#   traced while counting, and whether each approximation found the true
+#   mode and top 10.
+#
+#   Usage: python benchmarks/bench_frequency_sketch.py [item count, default 1M]
+
+
+import random
+import tracemalloc
+
+from bench_utils import arg_count, timed
+
+from frequency_sketch import CountMinSketch, SpaceSaving
+from hash_map_sc import find_mode_stream
+
+
+TOP = 10
+
+
+def make_items(count: int) -> list:
+    """
+    - Returns count keys with Zipf-like frequencies: a few very common keys
+        and a long tail of rare ones.
+    """
+
+    rnd = random.Random(261)
+    return ['item' + str(int(rnd.paretovariate(0.3))) for _ in range(count)]
+
+
+def exact(items: list):
+    return find_mode_stream(items, function='fnv1a')
+
+
+def count_min(items: list) -> CountMinSketch:
+    sketch = CountMinSketch.from_error(0.001, 0.01, function='fnv1a',
+                                       function2='murmur64a')
+    for item in items:
+        sketch.add(item)
+    return sketch
+
+
+def space_saving(items: list) -> SpaceSaving:
+    summary = SpaceSaving(1000, 'fnv1a')
+    for item in items:
+        summary.add(item)
+    return summary
+
+
+def measure(function, items: list) -> tuple:
+    """
+    - Returns (result, seconds, peak traced bytes) of function(items). The
+        time is taken from a separate, untraced run.
+    """
+
+    seconds = timed(function, items)
+    tracemalloc.start()
+    result = function(items)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+if __name__ == "__main__":
+
+    count = arg_count(1000000)
+    items = make_items(count)
+
+    counts = {}
+    for item in items:
+        counts[item] = counts.get(item, 0) + 1
+    trueTop = sorted(counts, key=counts.get, reverse=True)[:TOP]
+    print(f"{count} items, {len(counts)} distinct keys")
+
+    for label, function in (("exact", exact), ("count-min", count_min),
+                            ("space-saving", space_saving)):
+        result, seconds, peak = measure(function, items)
+
+        if function is exact:
+            modes, modeCount = result
+            found = f"mode {modes[0]} x{modeCount}"
+        elif function is count_min:
+            estimates = [result.estimate(key) for key in trueTop]
+            found = (f"top {TOP} estimates within "
+                     f"{max(estimate - counts[key] for key, estimate in zip(trueTop, estimates))}")
+        else:
+            top = result.top_k(TOP)
+            topKeys = [top[i][0] for i in range(top.length())]
+            found = f"top {TOP} correct: {topKeys == trueTop}"
+
+        print(f"{label:>14}: {count / seconds:10,.0f} items/s   "
+              f"peak {peak / 2 ** 20:7.2f} MiB   {found}")
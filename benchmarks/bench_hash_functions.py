@@ -0,0 +1,77 @@
+# Description:  Compares the registered hash functions on several key 
+#   sets: hashing speed, and the distribution of chain lengths when the
+#   keys are spread over a separate chaining table with one bucket per 
+#   key (an ideal hash gives about 37% empty buckets and a longest 
+#   chain in the single digits).
+#
+#   Usage: python benchmarks/bench_hash_functions.py [keys per set, default 100k]
+
+
+import random
+import time
+
+from bench_utils import arg_count
+
+from hash_functions import HASH_FUNCTIONS, KEYED_HASH_FUNCTIONS, get_hash_function
+
+
+def key_sets(count: int) -> dict:
+    """
+    - Returns lists of count keys by name, shaped like keys found in real 
+        tables.
+    """
+
+    rng = random.Random(261)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choice(letters) for _ in range(rng.randint(3, 12))))
+
+    return {
+        'sequential': ['key' + str(i) for i in range(count)],
+        'emails': ['user_' + str(i).zfill(7) + '@example.com' for i in range(count)],
+        'url paths': ['/api/v2/accounts/' + str(i * 7919) + '/orders?page=' + str(i % 50)
+                      for i in range(count)],
+        'words': sorted(words),
+    }
+
+
+def chain_histogram(hashes: list) -> str:
+    """
+    - Returns the share of buckets holding 0, 1, 2, 3 and 4+ keys, and the
+        longest chain, with one bucket per key.
+    """
+
+    capacity = len(hashes)
+    chains = [0] * capacity
+    for hashValue in hashes:
+        chains[hashValue % capacity] += 1
+
+    counts = [0] * 5
+    for length in chains:
+        counts[min(length, 4)] += 1
+
+    shares = ' '.join(f"{100 * c / capacity:5.1f}" for c in counts)
+    return f"{shares} {max(chains):7d}"
+
+
+if __name__ == "__main__":
+
+    count = arg_count(100000)
+    functions = list(HASH_FUNCTIONS) + list(KEYED_HASH_FUNCTIONS)
+
+    print(f"{count} keys per set; bucket shares in % for chain lengths 0 1 2 3 4+")
+    print(f"{'key set':>10} {'function':>16} {'keys/s':>10} "
+          f"{'0':>5} {'1':>5} {'2':>5} {'3':>5} {'4+':>5} {'longest':>7}")
+
+    for name, keys in key_sets(count).items():
+        for functionName in functions:
+            function = get_hash_function(functionName, bytes(16))
+
+            start = time.perf_counter()
+            hashes = [function(key) for key in keys]
+            seconds = time.perf_counter() - start
+
+            print(f"{name:>10} {functionName:>16} {count / seconds:10,.0f} "
+                  f"{chain_histogram(hashes)}")
@@ -0,0 +1,56 @@
+# Description:  Walking every key/value pair of a map: get_keys followed
+#   by a get per key (the only way before keys/values/items), against the
+#   items generator. Prints the time and the peak memory allocated during
+#   the walk (from tracemalloc) for each map type.
+#
+#   Usage: python benchmarks/bench_iteration.py [entry count, default 1M]
+#
+#   Python's built-in hash is used, as in bench_resize. Timings are taken
+#   without tracemalloc, which slows allocations down.
+
+
+import tracemalloc
+
+from bench_utils import arg_count, make_keys, timed
+
+import hash_map_oa
+import hash_map_sc
+
+
+def walk_get_keys(m) -> None:
+    keys = m.get_keys()
+    for i in range(keys.length()):
+        key = keys.get_unchecked(i)
+        m.get(key)
+
+
+def walk_items(m) -> None:
+    for key, value in m.items():
+        pass
+
+
+def peak_memory(function, m) -> int:
+    """ Return the peak bytes allocated while function(m) runs. """
+
+    tracemalloc.start()
+    function(m)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    count = arg_count(1000000)
+    keys = make_keys(count)
+
+    print(f"{count} entries")
+    print(f"{'map':<4} {'walk':<18} {'seconds':>8} {'peak MB':>8}")
+
+    for name, mapClass in (('sc', hash_map_sc.HashMap), ('oa', hash_map_oa.HashMap)):
+        m = mapClass(count, hash)
+        m.put_many(keys, keys)
+
+        for walkName, walk in (('get_keys + get', walk_get_keys), ('items', walk_items)):
+            seconds = timed(walk, m)
+            peak = peak_memory(walk, m)
+            print(f"{name:<4} {walkName:<18} {seconds:>8.3f} {peak / 2 ** 20:>8.2f}")
@@ -0,0 +1,71 @@
+# Description:  Compares the memory used by the open addressing hash map
+#   (one HashEntry object per entry) with the parallel array layout in
+#   hash_map_compact, and the time taken by put and get on each.
+#
+#   Usage: python benchmarks/bench_memory_layout.py [entry count, default 1M]
+#
+#   Keys and values are created before measuring, so the bytes reported
+#   are those of the table structure itself.
+
+
+import time
+import tracemalloc
+
+from bench_utils import arg_count, make_keys
+
+import hash_map_compact
+import hash_map_oa
+
+
+def build(mapClass, keys: list):
+    """
+    - Returns a map of the given class holding keys, each mapped to itself.
+    """
+
+    m = mapClass(8, 'murmur64a')
+    for key in keys:
+        m.put(key, key)
+    return m
+
+
+def measure(mapClass, keys: list) -> tuple:
+    """
+    - Returns the bytes allocated by a map of the given class holding 
+        keys, its capacity, and the seconds taken by the puts that build it
+        and by a get of every key.
+    - The bytes are measured on a separate build, since tracing 
+        allocations slows the puts down.
+    """
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    m = build(mapClass, keys)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del m
+
+    start = time.perf_counter()
+    m = build(mapClass, keys)
+    putSeconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        m.get(key)
+    getSeconds = time.perf_counter() - start
+
+    return allocated, m.get_capacity(), putSeconds, getSeconds
+
+
+if __name__ == "__main__":
+
+    count = arg_count(1000000)
+    keys = make_keys(count)
+
+    print(f"{count} entries")
+    print(f"{'layout':>9} {'capacity':>9} {'MB':>8} {'bytes/entry':>12} {'put s':>7} {'get s':>7}")
+
+    for label, mapClass in (("HashEntry", hash_map_oa.HashMap),
+                            ("compact", hash_map_compact.HashMap)):
+        allocated, capacity, putSeconds, getSeconds = measure(mapClass, keys)
+        print(f"{label:>9} {capacity:9d} {allocated / 2 ** 20:8.1f} "
+              f"{allocated / count:12.1f} {putSeconds:7.2f} {getSeconds:7.2f}")
@@ -0,0 +1,51 @@
+# Description:  Compares the open addressing hash map with the dense
+#   index layout in hash_map_ordered on a sparse table: entry count keys
+#   are added and then 90% of them removed, so most buckets are empty or
+#   tombstones. Prints the time taken by get_keys, a walk over keys() and
+#   a resize_table at the same capacity, and the memory used by the
+#   buckets and entry structures (from memory_report).
+#
+#   Usage: python benchmarks/bench_ordered.py [entry count, default 1M]
+#
+#   Python's built-in hash is used, as in bench_resize. The open
+#   addressing map is created with a tombstone_ratio of 1, so the removals
+#   leave the tombstones in place instead of compacting as they go.
+
+
+from bench_utils import arg_count, make_keys, timed
+
+import hash_map_oa
+import hash_map_ordered
+
+
+def walk_keys(m) -> None:
+    for key in m.keys():
+        pass
+
+
+if __name__ == "__main__":
+    count = arg_count(1000000)
+    keys = make_keys(count)
+
+    maps = (
+        ('oa', hash_map_oa.HashMap(count, hash, tombstone_ratio=1)),
+        ('ordered', hash_map_ordered.HashMap(count, hash)),
+    )
+
+    print(f"{count} keys added, {count - count // 10} removed")
+    print(f"{'map':<8} {'capacity':>9} {'get_keys':>9} {'keys()':>8} {'resize':>8} "
+          f"{'buckets MB':>11} {'nodes MB':>9}")
+
+    for name, m in maps:
+        for key in keys:
+            m.put(key, key)
+        for key in keys[count // 10:]:
+            m.remove(key)
+
+        getKeys = timed(m.get_keys)
+        walk = timed(walk_keys, m)
+        report = m.memory_report()
+        resize = timed(m.resize_table, m.get_capacity())
+
+        print(f"{name:<8} {m.get_capacity():>9} {getKeys:>9.4f} {walk:>8.4f} {resize:>8.4f} "
+              f"{report['buckets'] / 2 ** 20:>11.2f} {report['nodes'] / 2 ** 20:>9.2f}")
@@ -0,0 +1,46 @@
+# Description:  Bulk loads with and without presizing. Each map type is
+#   loaded with entry count keys by put starting from a capacity of 50 (as
+#   in the __main__ examples), which doubles the capacity over and over,
+#   by put into a map created with expected_size, and by from_pairs, which
+#   presizes and then calls put_many.
+#
+#   Usage: python benchmarks/bench_presize.py [entry count, default 1M]
+#
+#   Python's built-in hash is used, as in bench_resize.
+
+
+import time
+
+from bench_utils import arg_count, make_keys, timed
+
+import hash_map_oa
+import hash_map_sc
+
+
+def load(m, keys: list) -> None:
+    put = m.put
+    for key in keys:
+        put(key, key)
+
+
+if __name__ == "__main__":
+    count = arg_count(1000000)
+    keys = make_keys(count)
+    pairs = [(key, key) for key in keys]
+
+    print(f"{count} keys")
+    print(f"{'map':<4} {'load':<24} {'seconds':>8} {'capacity':>10}")
+
+    for name, mapClass in (('sc', hash_map_sc.HashMap), ('oa', hash_map_oa.HashMap)):
+        m = mapClass(50, hash)
+        seconds = timed(load, m, keys)
+        print(f"{name:<4} {'put from capacity 50':<24} {seconds:>8.3f} {m.get_capacity():>10}")
+
+        m = mapClass(50, hash, expected_size=count)
+        seconds = timed(load, m, keys)
+        print(f"{name:<4} {'put with expected_size':<24} {seconds:>8.3f} {m.get_capacity():>10}")
+
+        start = time.perf_counter()
+        m = mapClass.from_pairs(pairs, hash)
+        seconds = time.perf_counter() - start
+        print(f"{name:<4} {'from_pairs':<24} {seconds:>8.3f} {m.get_capacity():>10}")
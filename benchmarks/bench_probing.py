@@ -0,0 +1,89 @@
+# Description:  Reports the average and 99th percentile number of buckets
+#   examined by successful and unsuccessful lookups for each open 
+#   addressing probe strategy, across load factors from 0.25 to 0.9.
+#
+#   Usage: python benchmarks/bench_probing.py [capacity, default 65536]
+#
+#   Tables are filled with insert_entry so they can be loaded past the
+#   0.5 load factor where put would resize. Entries that a strategy
+#   can't place (quadratic probing doesn't reach every bucket) are
+#   reported as dropped. Python's built-in hash is used as the primary
+#   hash function; double hashing takes its step from hash_function_2.
+
+
+from bench_utils import arg_count, make_keys
+
+from a6_include import HashEntry
+from hash_map_oa import PROBE_STRATEGIES, HashMap
+
+
+LOAD_FACTORS = (0.25, 0.5, 0.6, 0.7, 0.8, 0.9)
+
+
+def probe_count(m: HashMap, key: str, hashValue: int) -> int:
+    """
+    - Returns the number of buckets a lookup of key examines, following 
+        the same probe sequence and stopping rules as HashMap.find_index.
+    """
+
+    buckets = m._buckets
+    capacity = m.get_capacity()
+
+    if m._probing == 'robin_hood':
+        index = m.get_probe_index(hashValue, 0)
+        distance = 0
+        currHashObject = buckets[index]
+
+        while (currHashObject and currHashObject.distance >= distance
+               and distance < capacity):
+            if currHashObject.hash == hashValue and currHashObject.key == key:
+                break
+            index = (index + 1) % capacity
+            distance += 1
+            currHashObject = buckets[index]
+
+        return distance + 1
+
+    step = m.get_probe_step(m.get_step_hash(key))
+
+    for iter in range(capacity):
+        currHashObject = buckets[m.get_probe_index(hashValue, iter, step)]
+        if currHashObject is None or currHashObject.key == key:
+            return iter + 1
+
+    return capacity
+
+
+def summarize(counts: list) -> str:
+    """
+    - Returns the average and 99th percentile of the probe counts.
+    """
+
+    counts.sort()
+    average = sum(counts) / len(counts)
+    p99 = counts[min(len(counts) - 1, int(len(counts) * 0.99))]
+    return f"{average:6.2f} {p99:5d}"
+
+
+if __name__ == "__main__":
+
+    capacity = arg_count(65536)
+    print(f"capacity {capacity}, probes per lookup as 'average p99'")
+    print(f"{'strategy':>10} {'load':>5} {'hit':>12} {'miss':>12} {'dropped':>8}")
+
+    for probing in PROBE_STRATEGIES:
+        for load in LOAD_FACTORS:
+            m = HashMap(capacity, hash, probing=probing)
+            count = int(load * m.get_capacity())
+
+            present = make_keys(count)
+            absent = make_keys(count, 'absent')
+
+            for key in present:
+                m.insert_entry(HashEntry(key, key, hash(key), m.get_step_hash(key)))
+
+            hits = [probe_count(m, key, hash(key)) for key in present]
+            misses = [probe_count(m, key, hash(key)) for key in absent]
+
+            print(f"{probing:>10} {load:5.2f} {summarize(hits):>12} "
+                  f"{summarize(misses):>12} {count - m.get_size():8d}")
@@ -0,0 +1,58 @@
+# Description:  Compares open addressing resize_table throughput when
+#   entries are migrated with insert_entry (the current path) against
+#   the prior approach of clearing the table and calling put for every
+#   live entry.
+#
+#   Usage: python benchmarks/bench_resize.py [entry count, default 1M]
+#
+#   Python's built-in hash is used as the hash function so that the
+#   timings reflect the resize work and not the clustering caused by
+#   the sum-of-ords sample hash functions.
+
+
+from bench_utils import arg_count, make_keys, timed
+
+from hash_map_oa import HashMap
+
+
+def resize_with_put(m: HashMap, new_capacity: int) -> None:
+    """
+    - The resize_table approach used before insert_entry: clear the
+        table and reinsert every live entry through put_hashed.
+    """
+
+    priorArray = m._buckets
+    priorArrayLength = m.get_capacity()
+
+    m._capacity = new_capacity
+    m.clear()
+
+    for i in range(priorArrayLength):
+        priorHashObject = priorArray[i]
+        if priorHashObject and not priorHashObject.is_tombstone:
+            m.put_hashed(priorHashObject.key, priorHashObject.value,
+                         priorHashObject.hash)
+
+
+def build_map(count: int) -> HashMap:
+    """
+    - Returns a map holding count entries.
+    """
+
+    m = HashMap(count * 3, hash)
+    for key in make_keys(count):
+        m.put(key, key)
+    return m
+
+
+if __name__ == "__main__":
+
+    count = arg_count(1000000)
+    print(f"resize_table with {count} entries")
+
+    for label, resize in (("put", resize_with_put),
+                          ("insert_entry", HashMap.resize_table)):
+        m = build_map(count)
+        seconds = timed(resize, m, m.get_capacity() * 2)
+        print(f"{label:>14}: {seconds:8.3f} s  "
+              f"{count / seconds:12,.0f} entries/s  size {m.get_size()}")
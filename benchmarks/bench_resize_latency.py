@@ -0,0 +1,73 @@
+# Description:  Tail latency of put with synchronous and incremental
+#   resizing. Every put is timed on its own while a map grows from a small
+#   capacity, and the median, high percentiles and worst case are printed
+#   for each map type, with and without an incremental_step.
+#
+#   Usage: python benchmarks/bench_resize_latency.py [entry count, default 1M]
+#
+#   A synchronous resize makes the one put that triggers it as slow as
+#   rehashing the whole table, so it shows up in the worst case (and, with
+#   enough resizes, in p99.9). Incremental resizing spreads that work over
+#   the following operations, which raises p99 instead (each of those puts
+#   also moves a few buckets).
+#   Python's built-in hash is used, as in bench_resize. The garbage
+#   collector is turned off while timing, since its full collections over
+#   millions of nodes pause for longer than any resize.
+
+
+import gc
+import time
+
+from bench_utils import arg_count, make_keys
+
+import hash_map_oa
+import hash_map_sc
+
+
+STEP = 8
+
+
+def put_latencies(m, keys: list) -> list:
+    """
+    - Returns the time each put took, in nanoseconds, sorted.
+    """
+
+    clock = time.perf_counter_ns
+    put = m.put
+    latencies = []
+
+    gc.collect()
+    gc.disable()
+    for key in keys:
+        start = clock()
+        put(key, key)
+        latencies.append(clock() - start)
+    gc.enable()
+
+    latencies.sort()
+    return latencies
+
+
+def percentile(latencies: list, fraction: float) -> int:
+    """ Return the latency at the given fraction of the sorted list. """
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+
+if __name__ == "__main__":
+    count = arg_count(1000000)
+    keys = make_keys(count)
+
+    print(f"{count} puts, incremental_step={STEP} (nanoseconds)")
+    print(f"{'map':<18} {'p50':>8} {'p99':>8} {'p99.9':>10} {'max':>14} {'total s':>8}")
+
+    maps = (
+        ('sc', lambda: hash_map_sc.HashMap(16, hash)),
+        ('sc incremental', lambda: hash_map_sc.HashMap(16, hash, incremental_step=STEP)),
+        ('oa', lambda: hash_map_oa.HashMap(16, hash)),
+        ('oa incremental', lambda: hash_map_oa.HashMap(16, hash, incremental_step=STEP)),
+    )
+
+    for name, factory in maps:
+        latencies = put_latencies(factory(), keys)
+        print(f"{name:<18} {percentile(latencies, 0.5):>8} {percentile(latencies, 0.99):>8} "
+              f"{percentile(latencies, 0.999):>10} {latencies[-1]:>14,} {sum(latencies) / 1e9:>8.2f}")
@@ -0,0 +1,60 @@
+# Description:  Cold start from a snapshot against rebuilding the map.
+#   Builds an open addressing map of entry count keys with put, saves it
+#   with save_snapshot, and opens it with SnapshotMap, printing the time
+#   of each step, the file size, and the time taken by a get of 100K keys
+#   on the built map and on the snapshot.
+#
+#   Usage: python benchmarks/bench_snapshot.py [entry count, default 1M]
+#
+#   Snapshots need a hash function registered by name, so fnv1a is used.
+#   The file is written to the system's temporary directory; just after
+#   it's written, its pages are still in the page cache, as they would be
+#   for a snapshot that other worker processes already have open.
+
+
+import os
+import tempfile
+import time
+
+from bench_utils import arg_count, make_keys, timed
+
+from hash_map_oa import HashMap
+from hash_map_snapshot import SnapshotMap, save_snapshot
+
+
+LOOKUPS = 100000
+
+
+def get_all(m, keys: list) -> None:
+    get = m.get
+    for key in keys:
+        get(key)
+
+
+if __name__ == "__main__":
+    count = arg_count(1000000)
+    keys = make_keys(count)
+    lookups = keys[::max(1, count // LOOKUPS)]
+    path = os.path.join(tempfile.mkdtemp(), 'bench.snapshot')
+
+    start = time.perf_counter()
+    m = HashMap(50, 'fnv1a')
+    for i, key in enumerate(keys):
+        m.put(key, i)
+    build = time.perf_counter() - start
+
+    save = timed(save_snapshot, m, path)
+
+    start = time.perf_counter()
+    snapshot = SnapshotMap(path)
+    load = time.perf_counter() - start
+
+    print(f"{count} keys, {os.path.getsize(path) / 2 ** 20:.1f} MB snapshot")
+    print(f"build with put   {build:10.4f} s")
+    print(f"save_snapshot    {save:10.4f} s")
+    print(f"open snapshot    {load:10.6f} s")
+    print(f"{len(lookups)} gets, built map  {timed(get_all, m, lookups):.4f} s")
+    print(f"{len(lookups)} gets, snapshot   {timed(get_all, snapshot, lookups):.4f} s")
+
+    snapshot.close()
+    os.remove(path)
@@ -0,0 +1,40 @@
+# Description:  Shared helpers for the benchmark scripts in this folder.
+#   Importing this module puts the repository root on sys.path so the
+#   scripts can be run directly, e.g. python benchmarks/bench_resize.py
+
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(function, *args) -> float:
+    """
+    - Calls function with the given arguments.
+    - Returns the elapsed wall clock time in seconds.
+    """
+
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def make_keys(count: int, prefix: str = 'key') -> list:
+    """
+    - Returns a list of count distinct string keys.
+    """
+
+    return [prefix + str(i) for i in range(count)]
+
+
+def arg_count(default: int) -> int:
+    """
+    - Returns the entry count passed as the first command line argument,
+        or default if there isn't one.
+    """
+
+    if len(sys.argv) > 1:
+        return int(sys.argv[1])
+    return default
@@ -0,0 +1,47 @@
+# Description:  Compares hashing a batch of keys one at a time with the
+#   sample hash functions against the NumPy versions in
+#   hash_functions_vectorized, for short and long keys, and times
+#   put_many on the chaining map with hash_function_1 both ways.
+#
+#   Usage: python benchmarks/bench_vectorized_hashing.py [key count, default 1M]
+
+
+from bench_utils import arg_count, make_keys, timed
+
+import hash_functions_vectorized
+from a6_include import hash_function_1, hash_function_2
+from hash_functions_vectorized import hash_many
+from hash_map_sc import HashMap
+
+
+def scalar_hashes(function, keys: list) -> list:
+    return [function(key) for key in keys]
+
+
+if __name__ == "__main__":
+
+    if hash_functions_vectorized.np is None:
+        raise SystemExit("NumPy isn't installed")
+
+    count = arg_count(1000000)
+
+    for label, keys in (("short keys", make_keys(count)),
+                        ("64 char keys", make_keys(count, 'k' * 58))):
+        print(f"\n{count} {label}")
+        for function in (hash_function_1, hash_function_2):
+            scalar = timed(scalar_hashes, function, keys)
+            vectorized = timed(hash_many, function, keys)
+            print(f"{function.__name__:>16}: scalar {scalar:7.3f} s   "
+                  f"numpy {vectorized:7.3f} s   {scalar / vectorized:5.1f}x")
+
+    # The sum-of-ords hash gives few distinct values for short keys, so
+    # the map holds fewer keys to keep the chains from dominating.
+    keys = make_keys(count // 10)
+    values = list(range(len(keys)))
+
+    vectorized = timed(HashMap(len(keys), hash_function_1).put_many, keys, values)
+    hash_functions_vectorized.np = None
+    scalar = timed(HashMap(len(keys), hash_function_1).put_many, keys, values)
+
+    print(f"\nput_many of {len(keys)} keys with hash_function_1: "
+          f"scalar {scalar:.3f} s   numpy {vectorized:.3f} s")
@@ -0,0 +1,183 @@
+# Description:  A parallel version of hash_map_sc.find_mode that spreads
+#   the counting over several processes with multiprocessing.
+#
+#   The work is done by the pool in two rounds, so the parent only does
+#   O(workers) work besides copying the items into slices:
+#   (1) Each worker takes one contiguous slice of the items and counts it
+#       in its own hash_map_sc.HashMap (with put_mode). It then splits its
+#       distinct keys into one shard per worker by the key's hash, so
+#       every copy of a key, in any slice, lands in the same shard.
+#   (2) Each worker takes one shard, adds up the counts the slices found
+#       for its keys and returns that shard's modes and mode count. Since
+#       no key is in two shards, a shard's totals are the key's total
+#       counts, and merging is just keeping the modes of the shards with
+#       the highest mode count.
+#   Only distinct keys and their counts are sent between the rounds, so
+#   the fewer distinct keys there are, the less there is to send. When
+#   most keys show up in every slice, each of them is counted, sent and
+#   added up once per worker, so the total work grows with the number of
+#   workers times the number of distinct keys.
+#
+#   Every process has to hash a key to the same value, or its counts 
+#   from different slices would go to different shards. A keyed hash 
+#   function given by name (such as 'siphash') would draw a different 
+#   random secret in each worker, so the secret is drawn once, in the 
+#   parent, and passed to the workers along with the name.
+
+
+import os
+from multiprocessing import Pool
+
+from a6_include import DynamicArray, hash_function_1, to_list
+from hash_functions import KEYED_HASH_FUNCTIONS, fmix64, get_hash_function
+from hash_functions_vectorized import hash_many
+from hash_map_sc import HashMap, find_mode, find_mode_stream
+
+
+def split(items, parts: int) -> list:
+    """
+    - Splits items (a dynamic array or any other iterable) into a list of
+        parts contiguous slices of (nearly) the same length.
+    """
+
+    if not isinstance(items, list):
+        items = to_list(items)
+
+    length = len(items)
+    return [items[i * length // parts:(i + 1) * length // parts]
+            for i in range(parts)]
+
+
+def count_slice(args: tuple) -> list:
+    """
+    - Worker function for round (1): counts one slice of the items.
+    - args is (items, shards, function, secret), where items is a list of
+        keys and function is the hash function for the worker's map (or 
+        its name, with secret for a keyed one). The map is 
+        presized with expected_size for every item being distinct, as in
+        find_mode, so it never resizes while counting.
+    - Returns a list of shards lists of (key, count) tuples, with each key
+        in shard fmix64(hash) % shards. fmix64 mixes the hash value first,
+        so a shard's keys still spread over all of the buckets of the map
+        that merge_shard adds them up in.
+    """
+
+    items, shards, function, secret = args
+    if isinstance(function, str):
+        function = get_hash_function(function, secret)
+
+    map = HashMap(64, function, expected_size=len(items))
+    putModeHashed = map.put_mode_hashed
+
+    for key, hashValue in zip(items, hash_many(map._hash_function, items)):
+        putModeHashed(key, hashValue)
+
+    shardCounts = [[] for _ in range(shards)]
+    for node in map.iter_nodes():
+        shardCounts[fmix64(node.hash) % shards].append((node.key, node.value))
+
+    return shardCounts
+
+
+def merge_shard(args: tuple) -> tuple:
+    """
+    - Worker function for round (2): adds up the counts of one shard.
+    - args is (sliceCounts, function, secret), where sliceCounts is a 
+        list with each slice's (key, count) tuples for the shard, and 
+        function and secret are as in count_slice.
+    - Returns the shard's modes (as a list, so they're cheap to send back)
+        and its mode count in a tuple.
+    """
+
+    sliceCounts, function, secret = args
+    if isinstance(function, str):
+        function = get_hash_function(function, secret)
+
+    map = HashMap(64, function,
+                  expected_size=max(len(counts) for counts in sliceCounts))
+    for counts in sliceCounts:
+        for key, count in counts:
+            map.update_with(key, lambda total: total + count, 0)
+
+    modeCount = 0
+    for key, total in map.items():
+        if total > modeCount:
+            modeCount = total
+
+    return ([key for key, total in map.items() if total == modeCount], modeCount)
+
+
+def find_mode_parallel(items, workers: int = 4,
+                       function=hash_function_1) -> (DynamicArray, int):
+    """
+    - Same as find_mode, but the items are counted in a pool of workers
+        processes: each one counts a slice of the items (count_slice), then
+        each one adds up the counts for a shard of the keys (merge_shard).
+    - items can be a dynamic array or any other iterable. function must be
+        picklable (a module-level function such as hash_function_1, or the
+        name of one registered in hash_functions). For the name of a keyed
+        hash function, one secret is generated here and used by every 
+        worker.
+    - Returns a dynamic array with the modes and the mode count in a tuple.
+        The modes are grouped by shard, so their order can differ from
+        find_mode's.
+    - With workers set to 1, the items are counted in this process by
+        find_mode_stream, without a pool.
+    """
+
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    if workers == 1:
+        return find_mode_stream(items, function=function)
+
+    secret = None
+    if isinstance(function, str) and function in KEYED_HASH_FUNCTIONS:
+        secret = os.urandom(16)
+
+    slices = split(items, workers)
+
+    with Pool(workers) as pool:
+        sliceResults = pool.map(count_slice,
+                                [(sliceItems, workers, function, secret)
+                                 for sliceItems in slices])
+        results = pool.map(merge_shard,
+                           [([shardCounts[shard] for shardCounts in sliceResults],
+                             function, secret)
+                            for shard in range(workers)])
+
+    modeCount = max(shardModeCount for _, shardModeCount in results)
+    modes = DynamicArray()
+
+    if modeCount > 0:
+        for shardModes, shardModeCount in results:
+            if shardModeCount == modeCount:
+                for key in shardModes:
+                    modes.append(key)
+
+    return (modes, modeCount)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    test_cases = (
+        ["Arch", "Manjaro", "Manjaro", "Mint", "Mint", "Mint", "Ubuntu", "Ubuntu", "Ubuntu", "Ubuntu"],
+        ["one", "two", "three", "four", "five"],
+        ["2", "4", "2", "6", "8", "4", "1", "3", "4", "5", "7", "3", "3", "2"]
+    )
+
+    for case in test_cases:
+        da = DynamicArray(case)
+        mode, frequency = find_mode_parallel(da, workers=2)
+        print(f"Input: {da}\nMode: {mode}, Frequency: {frequency}\n")
+
+    print("\nsame result as find_mode")
+    print("------------------------")
+    items = ['item' + str(i * i % 997) for i in range(20000)]
+    expectedModes, expectedCount = find_mode(DynamicArray(items))
+    for name in ('fnv1a', 'siphash'):
+        modes, modeCount = find_mode_parallel(items, workers=4, function=name)
+        print(name, modeCount, modeCount == expectedCount,
+              sorted(to_list(modes)) == sorted(to_list(expectedModes)))
@@ -0,0 +1,384 @@
+# Description:  Bounded-memory frequency counting for streams with too
+#   many distinct keys to count exactly with find_mode / put_mode, which
+#   keep one node per distinct key forever.
+#
+#   - CountMinSketch: a depth x width table of counters. Each key adds to
+#       one counter per row, and its count is estimated by the smallest of
+#       its counters. Estimates never undercount, and overcount by at most
+#       epsilon * (total count) with probability at least 1 - delta, for
+#       width = ceil(e / epsilon) and depth = ceil(ln(1 / delta)).
+#   - SpaceSaving: top-k counting with a fixed number m of counters. A key
+#       that isn't tracked when the counters are full replaces the key with
+#       the smallest count, inheriting that count (plus its own) as a possible
+#       overcount. Every key occurring more than (total count) / m times is
+#       guaranteed to be tracked, and each tracked count overcounts by at
+#       most its recorded error, which is at most (total count) / m.
+#
+#   The row hashes of the sketch are seeded variants of hash_function_1 and
+#   hash_function_2: row i uses fmix64(h1 + i * h2 + seed_i) % width, so
+#   the key is hashed twice however many rows there are. Keys that collide
+#   under both functions (such as anagrams of the same length with the
+#   sample functions) collide in every row; pass better functions (by name,
+#   as with the hash maps) where that matters.
+
+
+from math import ceil, e, log
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_functions import fmix64, get_hash_function
+from hash_map_sc import HashMap
+
+
+# Added to the seed for each row, so that every row gets a different seed.
+SEED_STEP = 0x9E3779B97F4A7C15
+
+
+class CountMinSketch:
+    def __init__(self, width: int, depth: int, function=hash_function_1,
+                 function2=hash_function_2, seed: int = 0) -> None:
+        """
+        Initialize a new Count-Min sketch with depth rows of width counters.
+        - function and function2 can also be the names of hash functions
+            registered in hash_functions.
+        - Sketches can only be compared or merged if they were created with
+            the same width, depth, functions and seed.
+        """
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be at least 1")
+
+        if isinstance(function, str):
+            function = get_hash_function(function)
+        if isinstance(function2, str):
+            function2 = get_hash_function(function2)
+
+        self._width = width
+        self._depth = depth
+        self._function = function
+        self._function2 = function2
+        self._seeds = tuple(fmix64(seed + row * SEED_STEP) for row in range(depth))
+        self._counts = DynamicArray.fill(width * depth, 0)
+        self._total = 0
+
+    @classmethod
+    def from_error(cls, epsilon: float, delta: float, **kwargs) -> "CountMinSketch":
+        """
+        - Returns a sketch sized so that estimate overcounts by at most
+            epsilon * total() with probability at least 1 - delta.
+        - Any other arguments are passed to the constructor.
+        """
+
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+
+        return cls(ceil(e / epsilon), ceil(log(1 / delta)), **kwargs)
+
+    def get_width(self) -> int:
+        """ Return the number of counters per row. """
+        return self._width
+
+    def get_depth(self) -> int:
+        """ Return the number of rows. """
+        return self._depth
+
+    def total(self) -> int:
+        """ Return the sum of all the counts added. """
+        return self._total
+
+    def get_indexes(self, key: str) -> list:
+        """
+        - Returns the index of the key's counter in each row, as an index
+            into the flat counts array (row * width + column).
+        """
+
+        hashValue = self._function(key)
+        hashValue2 = self._function2(key)
+        width = self._width
+
+        return [row * width + fmix64(hashValue + row * hashValue2 + seed) % width
+                for row, seed in enumerate(self._seeds)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        - Adds count (which can't be negative) to the key's counter in every
+            row.
+        - Returns the key's new estimate.
+        """
+
+        if count < 0:
+            raise ValueError("count can't be negative")
+
+        getCount = self._counts.get_unchecked
+        setCount = self._counts.set_unchecked
+        estimate = None
+
+        for index in self.get_indexes(key):
+            newCount = getCount(index) + count
+            setCount(index, newCount)
+            if estimate is None or newCount < estimate:
+                estimate = newCount
+
+        self._total += count
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        """
+        - Returns the estimated count of the key: the smallest of its
+            counters. It's never less than the true count, and is at most
+            the true count plus e / width * total() with probability at
+            least 1 - exp(-depth).
+        """
+
+        getCount = self._counts.get_unchecked
+        return min(getCount(index) for index in self.get_indexes(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """
+        - Adds the counts of another sketch with the same width, depth,
+            functions and seed (such as one filled from another shard of
+            the stream) into this one.
+        """
+
+        parameters = (self._width, self._depth, self._function, self._function2, self._seeds)
+        otherParameters = (other._width, other._depth, other._function,
+                           other._function2, other._seeds)
+
+        if parameters != otherParameters:
+            raise ValueError("can only merge sketches created with the same parameters")
+
+        getCount = self._counts.get_unchecked
+        setCount = self._counts.set_unchecked
+        getOtherCount = other._counts.get_unchecked
+
+        for index in range(self._width * self._depth):
+            setCount(index, getCount(index) + getOtherCount(index))
+
+        self._total += other._total
+
+
+class SpaceSavingCounter:
+    """
+    One tracked key of a SpaceSaving summary: its count, the most that
+    count can be over the true count, and its position in the min-heap.
+    """
+
+    __slots__ = ('key', 'count', 'error', 'index')
+
+    def __init__(self, key: str, count: int, error: int, index: int) -> None:
+        self.key = key
+        self.count = count
+        self.error = error
+        self.index = index
+
+    def __str__(self) -> str:
+        return f"({self.key}: {self.count}, error {self.error})"
+
+
+class SpaceSaving:
+    def __init__(self, capacity: int, function=hash_function_1) -> None:
+        """
+        Initialize a new Space-Saving summary that tracks at most capacity
+        keys.
+        - The counters are kept in a min-heap (a DynamicArray ordered by
+            count), so the smallest one can be replaced in O(log capacity),
+            and found by key through a hash_map_sc.HashMap that uses
+            function.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self._capacity = capacity
+        self._heap = DynamicArray()
+        self._counters = HashMap(capacity, function)
+        self._total = 0
+
+    def get_capacity(self) -> int:
+        """ Return the maximum number of keys tracked. """
+        return self._capacity
+
+    def total(self) -> int:
+        """ Return the sum of all the counts added. """
+        return self._total
+
+    def sift_down(self, counter: SpaceSavingCounter) -> None:
+        """
+        - Moves a counter whose count went up down the heap, swapping it
+            with its smaller child until neither child is smaller.
+        """
+
+        heap = self._heap
+        getCounter = heap.get_unchecked
+        setCounter = heap.set_unchecked
+        length = heap.length()
+        index = counter.index
+
+        while True:
+            child = 2 * index + 1
+            if child >= length:
+                break
+
+            if child + 1 < length and getCounter(child + 1).count < getCounter(child).count:
+                child += 1
+
+            childCounter = getCounter(child)
+            if childCounter.count >= counter.count:
+                break
+
+            setCounter(index, childCounter)
+            childCounter.index = index
+            index = child
+
+        setCounter(index, counter)
+        counter.index = index
+
+    def sift_up(self, counter: SpaceSavingCounter) -> None:
+        """
+        - Moves a counter just appended to the end of the heap up, swapping
+            it with its parent while the parent's count is larger.
+        """
+
+        heap = self._heap
+        getCounter = heap.get_unchecked
+        setCounter = heap.set_unchecked
+        index = counter.index
+
+        while index > 0:
+            parent = (index - 1) // 2
+            parentCounter = getCounter(parent)
+            if parentCounter.count <= counter.count:
+                break
+
+            setCounter(index, parentCounter)
+            parentCounter.index = index
+            index = parent
+
+        setCounter(index, counter)
+        counter.index = index
+
+    def add(self, key: str, count: int = 1) -> int:
+        """
+        - Adds count (at least 1) to the key's counter.
+        - If the key isn't tracked and there's a free counter, it starts
+            at count. Otherwise it takes over the counter with the smallest
+            count, which becomes its error: the key may have occurred up to
+            that many times before, while it wasn't tracked.
+        - A new counter is appended at the end of the heap and moved up by
+            sift_up. A counter whose count went up (including the smallest
+            one, taken over at the root) is moved down by sift_down.
+        - Returns the key's new (estimated) count.
+        """
+
+        if count < 1:
+            raise ValueError("count must be at least 1")
+
+        self._total += count
+        counter = self._counters.get(key)
+
+        if counter is None and self._heap.length() < self._capacity:
+            counter = SpaceSavingCounter(key, count, 0, self._heap.length())
+            self._heap.append(counter)
+            self._counters.put(key, counter)
+            self.sift_up(counter)
+            return counter.count
+
+        if counter is None:
+            counter = self._heap.get_unchecked(0)
+            self._counters.remove(counter.key)
+            counter.key = key
+            counter.error = counter.count
+            self._counters.put(key, counter)
+
+        counter.count += count
+        self.sift_down(counter)
+        return counter.count
+
+    def estimate(self, key: str) -> int:
+        """
+        - Returns the estimated count of the key. For a tracked key, it's
+            at least the true count and at most error more than it (see
+            top_k). For other keys, it's the smallest tracked count once
+            every counter is in use, which is an upper bound on their true
+            count, or 0 before then.
+        """
+
+        counter = self._counters.get(key)
+        if counter is not None:
+            return counter.count
+
+        if self._heap.length() < self._capacity:
+            return 0
+
+        return self._heap.get_unchecked(0).count
+
+    def top_k(self, k: int) -> DynamicArray:
+        """
+        - Returns a dynamic array of up to k (key, count, error) tuples for
+            the tracked keys with the highest counts, highest first. Each
+            key's true count is between count - error and count.
+        - Any key whose true count is above total() / capacity is tracked,
+            and the keys returned are the true top k whenever the k-th
+            count minus its error is at least the (k+1)-th count.
+        """
+
+        counters = [self._heap.get_unchecked(i) for i in range(self._heap.length())]
+        counters.sort(key=lambda counter: counter.count, reverse=True)
+
+        result = DynamicArray()
+        for counter in counters[:k]:
+            result.append((counter.key, counter.count, counter.error))
+
+        return result
+
+    def mode(self) -> (DynamicArray, int):
+        """
+        - Like find_mode, returns a dynamic array with the keys that have
+            the highest estimated count, and that count, in a tuple.
+        - The modes are exact whenever a mode's count minus its error is
+            greater than the count of every key not returned.
+        """
+
+        modes = DynamicArray()
+        modeCount = 0
+
+        for i in range(self._heap.length()):
+            counter = self._heap.get_unchecked(i)
+            if counter.count > modeCount:
+                modeCount = counter.count
+                modes = DynamicArray()
+                modes.append(counter.key)
+            elif counter.count == modeCount:
+                modes.append(counter.key)
+
+        return (modes, modeCount)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    words = ("the quick brown fox jumps over the lazy dog the fox and "
+             "the dog and the end").split()
+
+    print("\nCountMinSketch example")
+    print("----------------------")
+    sketch = CountMinSketch.from_error(0.01, 0.01)
+    for word in words:
+        sketch.add(word)
+    print(sketch.get_width(), sketch.get_depth(), sketch.total())
+    for word in ("the", "fox", "dog", "cat"):
+        print(word, sketch.estimate(word))
+
+    print("\nSpaceSaving example")
+    print("-------------------")
+    summary = SpaceSaving(4)
+    for word in words:
+        summary.add(word)
+    print(summary.top_k(3))
+    mode, frequency = summary.mode()
+    print(f"Mode: {mode}, Frequency: {frequency}")
+
+    # A new key added after a heavier one must not end up above it in the
+    #   heap, or the heavier key is the one evicted next.
+    summary = SpaceSaving(2)
+    for word in ("a", "a", "a", "a", "a", "b", "c"):
+        summary.add(word)
+    print(summary.top_k(2), summary.estimate('a') == 5)
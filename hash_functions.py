@@ -0,0 +1,223 @@
+# Description:  A registry of hash functions that can be passed to the 
+#   HashMap constructors in place of the sample hash functions, either 
+#   directly or by name (see get_hash_function). 
+#
+#   The sample hash_function_1 sums the character codes, so every 
+#   anagram collides and short keys land in a narrow range; 
+#   hash_function_2 only weighs each code by its position. The functions
+#   here hash the key's UTF-8 bytes into 64 bits:
+#
+#   - fnv1a: FNV-1a, one multiply per byte. Simple and well distributed.
+#   - murmur64a: MurmurHash64A, which mixes 8 bytes at a time, so long 
+#       keys need far fewer Python-level steps.
+#   - siphash: SipHash-2-4 with a secret 16 byte key, for tables that 
+#       hold keys chosen by someone who might want to force collisions.
+
+
+import os
+import struct
+
+from a6_include import hash_function_1, hash_function_2
+
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+
+FNV_OFFSET_BASIS = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+
+MURMUR_M = 0xC6A4A7935BD1E995
+MURMUR_R = 47
+
+
+def fnv1a(key: str) -> int:
+    """
+    - 64-bit FNV-1a hash of the key's UTF-8 bytes: each byte is xor-ed into
+        the hash, which is then multiplied by the FNV prime.
+    """
+
+    hash = FNV_OFFSET_BASIS
+    for byte in key.encode('utf-8'):
+        hash = ((hash ^ byte) * FNV_PRIME) & MASK64
+    return hash
+
+
+def murmur64a(key: str, seed: int = 0) -> int:
+    """
+    - 64-bit MurmurHash64A of the key's UTF-8 bytes.
+    - The bytes are read as little-endian 8 byte words, each of which is 
+        mixed into the hash with two multiplies and a shift, then the 
+        remaining bytes are mixed in together and the result is finalized
+        so every input bit affects every output bit.
+    - seed gives an independent hash function for each seed value.
+    """
+
+    data = key.encode('utf-8')
+    length = len(data)
+    end = length - length % 8
+
+    hash = (seed ^ (length * MURMUR_M)) & MASK64
+
+    for (word,) in struct.iter_unpack('<Q', data[:end]):
+        word = (word * MURMUR_M) & MASK64
+        word ^= word >> MURMUR_R
+        word = (word * MURMUR_M) & MASK64
+
+        hash ^= word
+        hash = (hash * MURMUR_M) & MASK64
+
+    if end < length:
+        hash ^= int.from_bytes(data[end:], 'little')
+        hash = (hash * MURMUR_M) & MASK64
+
+    hash ^= hash >> MURMUR_R
+    hash = (hash * MURMUR_M) & MASK64
+    hash ^= hash >> MURMUR_R
+    return hash
+
+
+def fmix64(value: int) -> int:
+    """
+    - MurmurHash3's 64-bit finalizer: mixes an integer so every input bit
+        affects every output bit. Used to derive independent seeded 
+        variants of another hash value (see frequency_sketch).
+    """
+
+    value &= MASK64
+    value ^= value >> 33
+    value = (value * 0xFF51AFD7ED558CCD) & MASK64
+    value ^= value >> 33
+    value = (value * 0xC4CEB9FE1A85EC53) & MASK64
+    value ^= value >> 33
+    return value
+
+
+def rotate_left(value: int, bits: int) -> int:
+    """
+    - Rotates a 64-bit value left by the given number of bits.
+    """
+
+    return ((value << bits) | (value >> (64 - bits))) & MASK64
+
+
+def siphash24(k0: int, k1: int, data: bytes) -> int:
+    """
+    - SipHash-2-4 of data under the 128-bit key given as two 64-bit 
+        little-endian halves k0 and k1.
+    """
+
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    length = len(data)
+    end = length - length % 8
+    last = ((length & 0xFF) << 56) | int.from_bytes(data[end:], 'little')
+
+    words = [word for (word,) in struct.iter_unpack('<Q', data[:end])]
+    words.append(last)
+
+    for index, word in enumerate(words):
+        v3 ^= word
+        for _ in range(2):
+            v0 = (v0 + v1) & MASK64
+            v1 = rotate_left(v1, 13) ^ v0
+            v0 = rotate_left(v0, 32)
+            v2 = (v2 + v3) & MASK64
+            v3 = rotate_left(v3, 16) ^ v2
+            v0 = (v0 + v3) & MASK64
+            v3 = rotate_left(v3, 21) ^ v0
+            v2 = (v2 + v1) & MASK64
+            v1 = rotate_left(v1, 17) ^ v2
+            v2 = rotate_left(v2, 32)
+        v0 ^= word
+
+    v2 ^= 0xFF
+    for _ in range(4):
+        v0 = (v0 + v1) & MASK64
+        v1 = rotate_left(v1, 13) ^ v0
+        v0 = rotate_left(v0, 32)
+        v2 = (v2 + v3) & MASK64
+        v3 = rotate_left(v3, 16) ^ v2
+        v0 = (v0 + v3) & MASK64
+        v3 = rotate_left(v3, 21) ^ v0
+        v2 = (v2 + v1) & MASK64
+        v1 = rotate_left(v1, 17) ^ v2
+        v2 = rotate_left(v2, 32)
+
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def make_siphash(secret: bytes = None):
+    """
+    - Returns a hash function that computes SipHash-2-4 of the key's UTF-8
+        bytes under the given 16 byte secret.
+    - If no secret is given, a random one is generated, so the hash values
+        (and the table layout) differ on every run.
+    """
+
+    if secret is None:
+        secret = os.urandom(16)
+
+    if len(secret) != 16:
+        raise ValueError("SipHash needs a 16 byte secret")
+
+    k0 = int.from_bytes(secret[:8], 'little')
+    k1 = int.from_bytes(secret[8:], 'little')
+
+    def siphash(key: str) -> int:
+        """SipHash-2-4 of the key's UTF-8 bytes under a secret key."""
+        return siphash24(k0, k1, key.encode('utf-8'))
+
+    return siphash
+
+
+# Hash functions by name.
+HASH_FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': fnv1a,
+    'murmur64a': murmur64a,
+}
+
+# Hash functions that need a secret, by name, each with a function that
+#   takes the secret (or None for a random one) and returns the hash 
+#   function.
+KEYED_HASH_FUNCTIONS = {
+    'siphash': make_siphash,
+}
+
+
+def get_hash_function(name: str, secret: bytes = None):
+    """
+    - Returns the hash function registered under name in HASH_FUNCTIONS or
+        KEYED_HASH_FUNCTIONS. secret is passed on to keyed hash functions.
+    - Raises ValueError for an unknown name.
+    """
+
+    if name in HASH_FUNCTIONS:
+        return HASH_FUNCTIONS[name]
+
+    if name in KEYED_HASH_FUNCTIONS:
+        return KEYED_HASH_FUNCTIONS[name](secret)
+
+    raise ValueError(f"Unknown hash function: {name}")
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nreference values")
+    print("----------------")
+    # Published test vectors for FNV-1a 64 and SipHash-2-4.
+    print(fnv1a('') == 0xCBF29CE484222325, fnv1a('a') == 0xAF63DC4C8601EC8C)
+    secret = bytes(range(16))
+    print(siphash24(0x0706050403020100, 0x0F0E0D0C0B0A0908, b'') == 0x726FDB47DD0E0E31,
+          siphash24(0x0706050403020100, 0x0F0E0D0C0B0A0908, bytes(range(15))) == 0xA129CA6149BE45E5)
+
+    print("\nanagrams")
+    print("--------")
+    for name in ('hash_function_1', 'hash_function_2', 'fnv1a', 'murmur64a', 'siphash'):
+        function = get_hash_function(name, secret)
+        print(name, [function(key) % 101 for key in ('listen', 'silent', 'enlist')])
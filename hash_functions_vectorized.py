@@ -0,0 +1,161 @@
+# Description:  NumPy versions of the sample hash functions that hash a
+#   whole batch of keys at once, for bulk loads (put_many, remove_many)
+#   where calling hash_function_1 or hash_function_2 once per key, with a
+#   Python-level loop over every character, is the main cost.
+#
+#   The batch is encoded into one flat uint32 array of character codes
+#   (the keys joined together, encoded as UTF-32), with an offset array
+#   recording where each key starts. Both hashes are then sums over each
+#   key's slice of that array, which NumPy computes with a cumulative sum:
+#
+#   - hash_function_1 sums the codes: ord(c)
+#   - hash_function_2 weighs each code by its 1-based position in its key:
+#       (position + 1) * ord(c)
+#
+#   The results are the same Python ints the scalar functions return, so
+#   tables filled either way stay compatible. If a batch could overflow
+#   NumPy's 64-bit integers, or contains keys that aren't strings, the
+#   scalar function is used instead.
+#
+#   NumPy is optional: without it, hash_many falls back to the scalar
+#   functions and the *_many functions raise ImportError.
+
+
+from a6_include import hash_function_1, hash_function_2
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+INT64_MAX = 2 ** 63 - 1
+
+
+def encode_keys(keys: list) -> tuple:
+    """
+    - Encodes a list of string keys into one flat uint32 array of
+        character codes, the start offset of each key in that array, and
+        each key's length.
+    - Returns (codes, starts, lengths). starts and lengths are int64.
+    """
+
+    if np is None:
+        raise ImportError("hash_functions_vectorized needs NumPy")
+
+    lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    starts = np.cumsum(lengths) - lengths
+
+    # surrogatepass keeps lone surrogates (which ord accepts) encodable.
+    data = ''.join(keys).encode('utf-32-le', 'surrogatepass')
+    codes = np.frombuffer(data, dtype='<u4')
+
+    return codes, starts, lengths
+
+
+def segment_sums(values, starts, lengths):
+    """
+    - Given a flat int64 array and the start and length of each segment,
+        returns the sum of each segment (0 for an empty one).
+    - Uses differences of one cumulative sum, since np.add.reduceat
+        doesn't handle empty segments.
+    """
+
+    totals = np.zeros(values.size + 1, dtype=np.int64)
+    np.cumsum(values, out=totals[1:])
+    return totals[starts + lengths] - totals[starts]
+
+
+def hash_function_1_many(keys: list):
+    """
+    - Batch version of hash_function_1: returns an int64 NumPy array with
+        the hash of each key, in order.
+    - Raises OverflowError if the sums could exceed 64 bits (see
+        hash_many, which falls back to the scalar function instead).
+    """
+
+    codes, starts, lengths = encode_keys(keys)
+    if codes.size and int(codes.max()) * codes.size > INT64_MAX:
+        raise OverflowError("batch is too large to hash in 64 bits")
+
+    return segment_sums(codes.astype(np.int64), starts, lengths)
+
+
+def hash_function_2_many(keys: list):
+    """
+    - Batch version of hash_function_2: returns an int64 NumPy array with
+        the hash of each key, in order.
+    - Each code's position in its key is its index in the flat array
+        minus the start of its key.
+    - Raises OverflowError if the sums could exceed 64 bits (see
+        hash_many, which falls back to the scalar function instead).
+    """
+
+    codes, starts, lengths = encode_keys(keys)
+
+    weights = np.arange(1, codes.size + 1, dtype=np.int64)
+    weights -= np.repeat(starts, lengths)
+
+    if codes.size and int(codes.max()) * int(weights.sum()) > INT64_MAX:
+        raise OverflowError("batch is too large to hash in 64 bits")
+
+    return segment_sums(codes.astype(np.int64) * weights, starts, lengths)
+
+
+def bucket_indices(hashes, capacity: int):
+    """
+    - Returns the home bucket of each hash in an int64 NumPy array, as
+        hash % capacity. That's the first index probed by every probing
+        mode in hash_map_oa (triangular probing masks with capacity - 1,
+        which is the same for a power of two capacity) and the bucket
+        used by hash_map_sc.
+    """
+
+    return np.asarray(hashes, dtype=np.int64) % capacity
+
+
+VECTORIZED_HASH_FUNCTIONS = {
+    hash_function_1: hash_function_1_many,
+    hash_function_2: hash_function_2_many,
+}
+
+
+def hash_many(function, keys: list) -> list:
+    """
+    - Returns a list with function(key) for each key, in order.
+    - If NumPy is installed, function is one of the sample hash functions
+        and every key is a string, the batch is hashed by the NumPy
+        version above. Otherwise (or if the batch could overflow), the
+        function is called once per key.
+    - The hashes are returned as Python ints either way, so they can be
+        cached on the map's nodes.
+    """
+
+    vectorized = VECTORIZED_HASH_FUNCTIONS.get(function)
+
+    if (np is not None and vectorized is not None and keys
+            and all(type(key) is str for key in keys)):
+        try:
+            return vectorized(keys).tolist()
+        except OverflowError:
+            pass
+
+    return [function(key) for key in keys]
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    keys = ['', 'a', 'ab', 'ba', 'key1', 'cheese', 'é', '日本語', '\U0001F600x']
+
+    print("hash_function_1:", hash_many(hash_function_1, keys))
+    print("hash_function_2:", hash_many(hash_function_2, keys))
+
+    if np is not None:
+        print("matches hash_function_1:",
+              hash_function_1_many(keys).tolist() == [hash_function_1(k) for k in keys])
+        print("matches hash_function_2:",
+              hash_function_2_many(keys).tolist() == [hash_function_2(k) for k in keys])
+        print("buckets (capacity 7):",
+              bucket_indices(hash_function_1_many(keys), 7).tolist())
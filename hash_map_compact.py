@@ -0,0 +1,396 @@
+# Description:  This program makes use of a hash map using open 
+#   addressing with triangular probing over a power of two capacity, 
+#   stored as parallel arrays instead of one HashEntry object per 
+#   bucket: a list of keys, a list of values, an array of the cached 
+#   64-bit hash values and a bytearray of bucket states (empty, full or
+#   tombstone). Probing only reads the dense hash and state arrays until
+#   the cached hash matches, and no object is allocated per entry. It 
+#   supports the same actions as the open addressing hash map: put, 
+#   get, remove, contains_key, clear, resize, get_keys, empty_buckets 
+#   and table_load.
+
+
+from array import array
+
+from a6_include import DynamicArray
+from hash_functions import get_hash_function
+from hash_map_oa import next_power_of_two, should_compact
+
+
+# Bucket states stored in the states bytearray.
+EMPTY = 0
+FULL = 1
+TOMBSTONE = 2
+
+# Hash values are stored in a signed 64-bit array, so they're cut down to 
+#   63 bits (which also makes negative hash values positive).
+HASH_MASK = (1 << 63) - 1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function,
+                 tombstone_ratio: float = 0.25) -> None:
+        """
+        Initialize new HashMap that uses
+        triangular probing over parallel arrays for collision resolution
+        - The capacity is rounded up to a power of two.
+        - tombstone_ratio is the share of the capacity that tombstones may 
+            take up before the table is automatically compacted.
+        - function can also be the name of a hash function registered in 
+            hash_functions.
+        """
+        if isinstance(function, str):
+            function = get_hash_function(function)
+
+        self._capacity = next_power_of_two(capacity)
+        self._hash_function = function
+        self._tombstone_ratio = tombstone_ratio
+        self.clear()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            state = self._states[i]
+            if state == EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i])
+                        + ' TS: ' + str(state == TOMBSTONE) + '\n')
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def get_hash(self, key: str) -> int:
+        """
+        - Calls the hash function and returns the hash value cut down to 63
+            bits, which is what the hashes array stores.
+        """
+
+        return self._hash_function(key) & HASH_MASK
+
+    def put(self, key: str, value: object) -> None:
+        """
+        - Adds a key/value pair to the location determined by the hash 
+            function.
+        - Steps below...
+
+        (1) If the load factor counting tombstones is at least 0.5, it calls
+            compact if hash_map_oa's should_compact says so, or else 
+            resize_table to double the capacity.
+        (2) Probes from the home bucket, adding 1, 2, 3, ... buckets each 
+            step (the triangular numbers), masked with capacity - 1.
+        (3) A full bucket whose cached hash and key match has its value 
+            replaced. The first tombstone is remembered, since the key may 
+            still exist further along.
+        (4) At an empty bucket, the key/value pair is stored in the first
+            tombstone found, or else in the empty bucket.
+
+        - Returns None
+        """
+
+        hashValue = self.get_hash(key)
+
+        if self.occupied_load() >= 0.5:
+            if should_compact(self._size, self._tombstones, self._capacity):
+                self.compact()
+            else:
+                self.resize_table(self._capacity * 2)
+
+        states = self._states
+        hashes = self._hashes
+        keys = self._keys
+        mask = self._capacity - 1
+
+        index = hashValue & mask
+        tombstoneIndex = -1
+
+        for iter in range(1, self._capacity + 1):
+            state = states[index]
+
+            if state == EMPTY:
+                break
+
+            if state == TOMBSTONE:
+                if tombstoneIndex < 0:
+                    tombstoneIndex = index
+            elif hashes[index] == hashValue and keys[index] == key:
+                self._values[index] = value
+                return
+
+            index = (index + iter) & mask
+
+        if tombstoneIndex >= 0:
+            index = tombstoneIndex
+            self._tombstones -= 1
+
+        states[index] = FULL
+        hashes[index] = hashValue
+        keys[index] = key
+        self._values[index] = value
+        self._size += 1
+
+    def find_index(self, key: str, hashValue: int) -> int:
+        """
+        - Given a key and its (63-bit) hash value, returns the index of the 
+            bucket holding the key, or -1 if the key isn't in the hash table.
+        - Only the states and hashes arrays are read until a cached hash 
+            matches; tombstones are skipped, and an empty bucket ends the 
+            search.
+        """
+
+        states = self._states
+        hashes = self._hashes
+        mask = self._capacity - 1
+
+        index = hashValue & mask
+
+        for iter in range(1, self._capacity + 1):
+            state = states[index]
+
+            if state == EMPTY:
+                return -1
+
+            if state == FULL and hashes[index] == hashValue and self._keys[index] == key:
+                return index
+
+            index = (index + iter) & mask
+
+        return -1
+
+    def get(self, key: str) -> object:
+        """
+        - Given a key, returns the value associated with the key, or None 
+            if the key isn't in the hash map.
+        """
+
+        index = self.find_index(key, self.get_hash(key))
+
+        if index < 0:
+            return
+
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        - Returns True if the key exists in the hash map, otherwise returns 
+            False.
+        """
+
+        return self.find_index(key, self.get_hash(key)) >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        - Given a key, marks its bucket as a tombstone and releases the key 
+            and value, reducing the size by 1 and increasing the tombstone 
+            count by 1.
+        - If the tombstones then make up more than the tombstone_ratio 
+            share of the capacity, it calls compact.
+        - Does nothing if the key doesn't exist in the hash map.
+        - Returns None
+        """
+
+        index = self.find_index(key, self.get_hash(key))
+
+        if index < 0:
+            return
+
+        self._states[index] = TOMBSTONE
+        self._keys[index] = None
+        self._values[index] = None
+        self._size -= 1
+        self._tombstones += 1
+
+        if self._tombstones > self._tombstone_ratio * self._capacity:
+            self.compact()
+
+    def table_load(self) -> float:
+        """
+        - Returns load factor for the hash table defined as size / capacity.
+        - The size does not include tombstones.
+        """
+
+        return self._size / self._capacity
+
+    def occupied_load(self) -> float:
+        """
+        - Returns the share of the buckets that are not empty, defined as 
+            (size + tombstones) / capacity.
+        """
+
+        return (self._size + self._tombstones) / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        - Returns the number of empty buckets in the hash table as defined
+            by capacity minus size minus tombstones.
+        """
+
+        return self._capacity - self._size - self._tombstones
+
+    def compact(self) -> None:
+        """
+        - Rehashes all existing key/value pairs at the same capacity, which
+            removes every tombstone from the table.
+        - Returns: None
+        """
+
+        self.resize_table(self._capacity)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        - Changes the capacity (rounded up to a power of two) and moves every
+            key/value pair into new arrays, probing with the cached hash 
+            values, so the hash function is never called during a resize.
+        - If the existing entries would put the load factor at or above 
+            0.5, the capacity is doubled until they fit.
+        - If new_capacity is less than 1, or new_capacity is less than the 
+            size, this method does nothing.
+        - Returns: None
+        """
+
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        new_capacity = next_power_of_two(new_capacity)
+        while (self._size - 1) / new_capacity >= 0.5:
+            new_capacity *= 2
+
+        priorStates = self._states
+        priorHashes = self._hashes
+        priorKeys = self._keys
+        priorValues = self._values
+        priorCapacity = self._capacity
+
+        self._capacity = new_capacity
+        self.clear()
+
+        states = self._states
+        hashes = self._hashes
+        keys = self._keys
+        values = self._values
+        mask = new_capacity - 1
+
+        for i in range(priorCapacity):
+            if priorStates[i] != FULL:
+                continue
+
+            hashValue = priorHashes[i]
+            index = hashValue & mask
+            iter = 1
+            while states[index] != EMPTY:
+                index = (index + iter) & mask
+                iter += 1
+
+            states[index] = FULL
+            hashes[index] = hashValue
+            keys[index] = priorKeys[i]
+            values[index] = priorValues[i]
+
+            self._size += 1
+
+    def clear(self) -> None:
+        """
+        - Clears the contents of the hash map by allocating new arrays.
+        - Doesn't change the capacity.
+        - Returns: None
+        """
+
+        capacity = self._capacity
+
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        - Returns a dynamic array object with all the keys stored in the 
+            hash table.
+        """
+
+        newArray = DynamicArray()
+        states = self._states
+
+        for i in range(self._capacity):
+            if states[i] == FULL:
+                newArray.append(self._keys[i])
+
+        return newArray
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(50, 'fnv1a')
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nget / contains_key example")
+    print("--------------------------")
+    m = HashMap(30, 'murmur64a')
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key)) and m.get(str(key)) == key * 42
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nremove example")
+    print("--------------")
+    m = HashMap(50, 'fnv1a')
+    print(m.get('key1'))
+    m.put('key1', 10)
+    print(m.get('key1'))
+    m.remove('key1')
+    print(m.get('key1'))
+    m.remove('key4')
+
+    print("\nresize / get_keys example")
+    print("-------------------------")
+    m = HashMap(10, 'fnv1a')
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    print(m.get_size(), m.get_capacity())
+    m.resize_table(1)
+    print(m.get_size(), m.get_capacity())
+    m.put('200', '2000')
+    m.remove('100')
+    keys = m.get_keys()
+    print(sorted(keys[i] for i in range(keys.length())))
+
+    print("\nremove / put churn example")
+    print("--------------------------")
+    m = HashMap(2048, 'fnv1a')
+    for i in range(1023):
+        m.put('key' + str(i), i)
+    for i in range(10000):
+        m.remove('key' + str(i))
+        m.put('key' + str(i + 1023), i)
+    print(m.get_size(), m.get_capacity(), m.table_load())
@@ -0,0 +1,190 @@
+# Description:  A thread-safe hash map made of several independent hash
+#   maps (shards), each guarded by its own lock (lock striping).
+#
+#   Neither HashMap is safe to share between threads on its own: a put
+#   that crosses the load threshold swaps in a new bucket array while
+#   another thread may be reading the old one, and the size updates
+#   aren't atomic. Here every key belongs to exactly one shard, chosen
+#   from Python's built-in hash of the key (which str caches, so this adds
+#   almost nothing), and every operation on a shard holds that shard's
+#   lock. Threads working on different shards never wait for each other,
+#   and a resize only locks the shard being resized, which also keeps each
+#   resize smaller.
+#
+#   The shards can be either separate chaining (hash_map_sc) or open
+#   addressing (hash_map_oa) hash maps.
+
+
+from threading import Lock
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray, hash_function_1
+
+
+MAP_TYPES = {
+    'sc': hash_map_sc.HashMap,
+    'oa': hash_map_oa.HashMap,
+}
+
+
+class HashMap:
+    def __init__(self, capacity: int, function=hash_function_1,
+                 shards: int = 16, map_type: str = 'sc', **kwargs) -> None:
+        """
+        Initialize new thread-safe HashMap split into shards independent
+        hash maps of map_type ('sc' or 'oa').
+        - capacity is the total initial capacity, shared between the
+            shards. function (which can also be a registered name) and any
+            other arguments, such as probing, are passed to each shard.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+
+        if map_type not in MAP_TYPES:
+            raise ValueError(f"Unknown map type: {map_type}")
+
+        shardCapacity = max(1, -(-capacity // shards))
+        mapClass = MAP_TYPES[map_type]
+
+        self._shards = tuple(mapClass(shardCapacity, function, **kwargs)
+                             for _ in range(shards))
+        self._locks = tuple(Lock() for _ in range(shards))
+        self._shard_count = shards
+
+    def get_shard_count(self) -> int:
+        """ Return the number of shards. """
+        return self._shard_count
+
+    def get_shard(self, key: str) -> tuple:
+        """
+        - Returns the (shard, lock) pair that the key belongs to.
+        """
+
+        index = hash(key) % self._shard_count
+        return self._shards[index], self._locks[index]
+
+    def put(self, key: str, value: object) -> None:
+        """ Same as HashMap.put, holding the key's shard lock. """
+
+        shard, lock = self.get_shard(key)
+        with lock:
+            shard.put(key, value)
+
+    def get(self, key: str) -> object:
+        """ Same as HashMap.get, holding the key's shard lock. """
+
+        shard, lock = self.get_shard(key)
+        with lock:
+            return shard.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """ Same as HashMap.contains_key, holding the key's shard lock. """
+
+        shard, lock = self.get_shard(key)
+        with lock:
+            return shard.contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """ Same as HashMap.remove, holding the key's shard lock. """
+
+        shard, lock = self.get_shard(key)
+        with lock:
+            shard.remove(key)
+
+    def pop(self, key: str, default: object = None) -> object:
+        """ Same as HashMap.pop, holding the key's shard lock. """
+
+        shard, lock = self.get_shard(key)
+        with lock:
+            return shard.pop(key, default)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        - Same as HashMap.setdefault. Holding the shard lock makes the
+            check and the insert one atomic step.
+        """
+
+        shard, lock = self.get_shard(key)
+        with lock:
+            return shard.setdefault(key, default)
+
+    def get_or_compute(self, key: str, factory) -> object:
+        """
+        - Same as HashMap.get_or_compute. factory is called while the shard
+            lock is held, so it's called at most once per missing key, but
+            it must not use this map.
+        """
+
+        shard, lock = self.get_shard(key)
+        with lock:
+            return shard.get_or_compute(key, factory)
+
+    def update_with(self, key: str, function, default: object = None) -> object:
+        """
+        - Same as HashMap.update_with, as one atomic step (so concurrent
+            counters don't lose updates). function is called while the
+            shard lock is held and must not use this map.
+        """
+
+        shard, lock = self.get_shard(key)
+        with lock:
+            return shard.update_with(key, function, default)
+
+    def get_size(self) -> int:
+        """
+        - Returns the number of keys, summing the shard sizes one shard at
+            a time. With other threads changing the map, it's the size at
+            some point during the call, not a single snapshot.
+        """
+
+        size = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                size += shard.get_size()
+        return size
+
+    def clear(self) -> None:
+        """ Clears each shard in turn, holding its lock. """
+
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        - Returns a dynamic array with the keys of every shard, copying
+            each shard's keys while holding its lock.
+        """
+
+        keys = DynamicArray()
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shardKeys = shard.get_keys()
+            for i in range(shardKeys.length()):
+                keys.append(shardKeys.get_unchecked(i))
+        return keys
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    from threading import Thread
+
+    print("\nCounting from 8 threads")
+    print("-----------------------")
+    m = HashMap(64, hash_function_1, shards=4)
+
+    def count_words() -> None:
+        for _ in range(100):
+            for word in ("apple", "grape", "melon", "peach"):
+                m.update_with(word, lambda count: count + 1, 0)
+
+    threads = [Thread(target=count_words) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(m.get_size(), [m.get(word) for word in ("apple", "grape", "melon", "peach")])
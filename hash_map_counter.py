@@ -0,0 +1,330 @@
+# Description:  A counting map built upon the separate chaining HashMap,
+#   for live counters whose top keys are read often. put_mode can count
+#   keys, but finding the mode then means scanning every key (as find_mode
+#   does). CounterMap also keeps a frequency index up to date as counts
+#   change:
+#
+#   - Every distinct count in use has a FrequencyBucket holding the keys
+#       with that count, in a doubly linked list of their CounterEntry
+#       objects.
+#   - The buckets are in a doubly linked list of their own, in increasing
+#       order of count, with a pointer to the last (highest) one.
+#
+#   Adding or taking 1 from a count moves its entry to the neighboring
+#   bucket, so increment, decrement and count are O(1) (amortized, like
+#   the HashMap), mode is O(number of modes) and most_common(k) is O(k),
+#   however many distinct keys there are.
+
+
+from a6_include import DynamicArray, hash_function_1
+from hash_map_sc import HashMap
+
+
+class CounterEntry:
+    """
+    A counted key: its count, the FrequencyBucket for that count, and its
+    neighbors in that bucket's list of keys.
+    """
+
+    __slots__ = ('key', 'count', 'bucket', 'prev', 'next')
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.count = 0
+        self.bucket = None
+        self.prev = None
+        self.next = None
+
+
+class FrequencyBucket:
+    """
+    The keys that share a count, and the neighboring buckets with the next
+    lower and next higher counts in use.
+    """
+
+    __slots__ = ('count', 'head', 'size', 'prev', 'next')
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.head = None
+        self.size = 0
+        self.prev = None
+        self.next = None
+
+    def add(self, entry: CounterEntry) -> None:
+        """ Add an entry at the front of the bucket's list of keys. """
+        entry.bucket = self
+        entry.prev = None
+        entry.next = self.head
+        if self.head is not None:
+            self.head.prev = entry
+        self.head = entry
+        self.size += 1
+
+    def discard(self, entry: CounterEntry) -> None:
+        """ Unlink an entry from the bucket's list of keys. """
+        if entry.prev is not None:
+            entry.prev.next = entry.next
+        else:
+            self.head = entry.next
+        if entry.next is not None:
+            entry.next.prev = entry.prev
+        entry.bucket = entry.prev = entry.next = None
+        self.size -= 1
+
+
+class CounterMap:
+    def __init__(self, capacity: int = 64, function=hash_function_1) -> None:
+        """
+        Initialize a new, empty counting map.
+        - capacity and function are passed to the underlying
+            hash_map_sc.HashMap, which maps each key to its CounterEntry.
+            function can also be the name of a hash function registered in
+            hash_functions.
+        """
+        self._map = HashMap(capacity, function)
+        self._hash_function = self._map._hash_function
+        self._lowest = None
+        self._highest = None
+        self._total = 0
+
+    def get_size(self) -> int:
+        """ Return the number of keys with a count above 0. """
+        return self._map.get_size()
+
+    def total(self) -> int:
+        """ Return the sum of all the counts. """
+        return self._total
+
+    def find_entry(self, key: str, hashValue: int) -> CounterEntry:
+        """
+        - Returns the key's CounterEntry, or None if it isn't counted.
+        """
+
+        hashObject = self._map.get_hashed_object(hashValue)
+        if hashObject is None:
+            return None
+
+        linkedlistNode = hashObject.contains(key, hashValue)
+        if linkedlistNode is None:
+            return None
+
+        return linkedlistNode.value
+
+    def insert_bucket(self, count: int, prev: FrequencyBucket) -> FrequencyBucket:
+        """
+        - Creates a bucket for count and links it in right after prev (or
+            first, if prev is None). prev must be the bucket with the
+            highest count below count.
+        """
+
+        bucket = FrequencyBucket(count)
+        bucket.prev = prev
+
+        if prev is None:
+            bucket.next = self._lowest
+            self._lowest = bucket
+        else:
+            bucket.next = prev.next
+            prev.next = bucket
+
+        if bucket.next is None:
+            self._highest = bucket
+        else:
+            bucket.next.prev = bucket
+
+        return bucket
+
+    def remove_bucket(self, bucket: FrequencyBucket) -> None:
+        """ Unlinks an empty bucket from the list of buckets. """
+
+        if bucket.prev is None:
+            self._lowest = bucket.next
+        else:
+            bucket.prev.next = bucket.next
+
+        if bucket.next is None:
+            self._highest = bucket.prev
+        else:
+            bucket.next.prev = bucket.prev
+
+    def move_entry(self, entry: CounterEntry, count: int) -> None:
+        """
+        - Moves an entry to the bucket for count, creating that bucket if
+            needed, and drops its old bucket if that leaves it empty.
+        - The new bucket is found by walking from the old one, so it's O(1)
+            when the count changes by 1; larger changes also walk past the
+            buckets in between. count must be above 0.
+
+        Steps:
+        (1) Starting from the entry's bucket (or, for a new entry, from
+            before the lowest bucket), walk up the buckets while the next
+            one's count is at most count, or down while the current one's
+            count is above count.
+        (2) If the bucket reached has the count, use it. Otherwise create
+            one right after it.
+        (3) Unlink the entry from its old bucket (removing the bucket if
+            it's now empty) and add it to the new one.
+        """
+
+        oldBucket = entry.bucket
+        prev = oldBucket
+
+        if prev is None or prev.count < count:
+            nextBucket = self._lowest if prev is None else prev.next
+            while nextBucket is not None and nextBucket.count <= count:
+                prev = nextBucket
+                nextBucket = nextBucket.next
+        else:
+            while prev is not None and prev.count > count:
+                prev = prev.prev
+
+        if prev is not None and prev.count == count:
+            bucket = prev
+        else:
+            bucket = self.insert_bucket(count, prev)
+
+        if oldBucket is not None:
+            oldBucket.discard(entry)
+            if oldBucket.size == 0:
+                self.remove_bucket(oldBucket)
+
+        entry.count = count
+        bucket.add(entry)
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        - Adds delta (at least 1) to the key's count, starting it at 0 if the
+            key isn't counted yet.
+        - Calls the hash function once.
+        - Returns the new count.
+        """
+
+        if delta < 1:
+            raise ValueError("delta must be at least 1")
+
+        hashValue = self._hash_function(key)
+        entry = self.find_entry(key, hashValue)
+
+        if entry is None:
+            entry = CounterEntry(key)
+            self._map.put_hashed(key, entry, hashValue)
+
+        self.move_entry(entry, entry.count + delta)
+        self._total += delta
+        return entry.count
+
+    def decrement(self, key: str, delta: int = 1) -> int:
+        """
+        - Takes delta (at least 1) from the key's count. A key whose count
+            reaches 0 (or less) is removed. Keys that aren't counted are
+            ignored.
+        - Calls the hash function once (twice if the key is removed).
+        - Returns the new count.
+        """
+
+        if delta < 1:
+            raise ValueError("delta must be at least 1")
+
+        hashValue = self._hash_function(key)
+        entry = self.find_entry(key, hashValue)
+
+        if entry is None:
+            return 0
+
+        if entry.count <= delta:
+            self.remove(key)
+            return 0
+
+        self.move_entry(entry, entry.count - delta)
+        self._total -= delta
+        return entry.count
+
+    def remove(self, key: str) -> None:
+        """
+        - Stops counting the key. Does nothing if it isn't counted.
+        - Returns None
+        """
+
+        hashValue = self._hash_function(key)
+        entry = self.find_entry(key, hashValue)
+
+        if entry is None:
+            return
+
+        bucket = entry.bucket
+        bucket.discard(entry)
+        if bucket.size == 0:
+            self.remove_bucket(bucket)
+
+        self._total -= entry.count
+        self._map.remove(key)
+
+    def count(self, key: str) -> int:
+        """ Return the key's count, or 0 if it isn't counted. """
+
+        entry = self.find_entry(key, self._hash_function(key))
+        if entry is None:
+            return 0
+        return entry.count
+
+    def mode(self) -> (DynamicArray, int):
+        """
+        - Like find_mode, returns a dynamic array with the keys that have
+            the highest count, and that count, in a tuple. Only the
+            highest bucket is read.
+        """
+
+        modes = DynamicArray()
+        bucket = self._highest
+
+        if bucket is None:
+            return (modes, 0)
+
+        entry = bucket.head
+        while entry is not None:
+            modes.append(entry.key)
+            entry = entry.next
+
+        return (modes, bucket.count)
+
+    def most_common(self, k: int) -> DynamicArray:
+        """
+        - Returns a dynamic array of up to k (key, count) tuples with the
+            highest counts, highest first. Keys with equal counts are in no
+            particular order.
+        - Walks down from the highest bucket and stops after k keys, so
+            it's O(k).
+        """
+
+        result = DynamicArray()
+        bucket = self._highest
+
+        while bucket is not None and result.length() < k:
+            entry = bucket.head
+            while entry is not None and result.length() < k:
+                result.append((entry.key, bucket.count))
+                entry = entry.next
+            bucket = bucket.prev
+
+        return result
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nCounterMap example")
+    print("------------------")
+    counter = CounterMap()
+    for word in "to be or not to be that is the question".split():
+        counter.increment(word)
+    mode, frequency = counter.mode()
+    print(f"Mode: {mode}, Frequency: {frequency}")
+    print(counter.most_common(3))
+
+    counter.increment('question', 5)
+    counter.decrement('to')
+    counter.decrement('be', 2)
+    print(counter.count('question'), counter.count('to'), counter.count('be'))
+    print(counter.most_common(3), counter.get_size(), counter.total())
@@ -0,0 +1,571 @@
+# Description:  This program makes use of a hash map (which is built 
+#   upon two dynamic arrays) using cuckoo hashing for collision 
+#   resolution. Every key has exactly one possible bucket in each of 
+#   the two tables, one chosen by each of two hash functions, so a 
+#   lookup checks at most two buckets (plus a small stash that is 
+#   usually empty) no matter how full the table is. It supports the 
+#   same actions as the open addressing hash map: put, get, remove, 
+#   contains_key, clear, resize, get_keys, empty_buckets and 
+#   table_load.
+#
+#   A key's bucket in each table is picked from both of its hash values,
+#   mixed with that table's seed by fmix64, so the two tables' indexes are
+#   independent and well spread whatever the hash functions are. Keys with
+#   the same pair of hash values still always share both buckets, though,
+#   and no choice of seeds or capacity can separate them. So only one key
+#   per pair of hash values is kept in the tables (or the stash); the 
+#   others go to an overflow map, a separate chaining hash map that is 
+#   only searched when it isn't empty. The sum-of-ords sample functions 
+#   (hash_function_1 and hash_function_2, the defaults) give the same pair
+#   to many similar keys (str0 ... str4999 have only 941 distinct pairs), 
+#   so with them most such keys end up in the overflow map, and lookups 
+#   cost what they do in the separate chaining hash map. Well spread 
+#   functions such as murmur64a and fnv1a keep it empty.
+
+
+from a6_include import (DynamicArray, HashEntry,
+                        hash_function_1, hash_function_2)
+from hash_functions import fmix64, get_hash_function
+from hash_map_sc import HashMap as ChainedHashMap
+
+
+# Number of times rehash tries new seeds at one capacity before doubling it.
+REHASH_ATTEMPTS = 4
+
+# Number of times rehash doubles the capacity before giving up.
+MAX_GROWTHS = 3
+
+# Multiplies the first hash value before the second is added (see get_index).
+GOLDEN_RATIO_64 = 0x9E3779B97F4A7C15
+
+
+class HashMap:
+    def __init__(self, capacity: int, function=hash_function_1,
+                 function2=hash_function_2, stash_size: int = 4) -> None:
+        """
+        Initialize new HashMap that uses
+        cuckoo hashing for collision resolution
+        - capacity is the number of buckets in each of the two tables.
+        - function chooses a key's bucket in the first table and 
+            function2 its bucket in the second table.
+        - stash_size is the most entries that are ever held aside when an
+            insert can't find them a bucket. Once the stash is full, the 
+            table is rehashed (see rehash).
+        - Either function can also be the name of a hash function 
+            registered in hash_functions. Keys that both functions give the
+            same pair of hash values as a key already in the tables go to 
+            the overflow map (see the description at the top).
+        """
+        if isinstance(function, str):
+            function = get_hash_function(function)
+        if isinstance(function2, str):
+            function2 = get_hash_function(function2)
+
+        capacity = max(capacity, 1)
+
+        self._tables = (DynamicArray(), DynamicArray())
+        for table in self._tables:
+            for _ in range(capacity):
+                table.append(None)
+
+        self._stash = DynamicArray()
+        self._stash_size = stash_size
+        self._seeds = [fmix64(1), fmix64(2)]
+
+        self._capacity = capacity
+        self._hash_function = function
+        self._hash_function_2 = function2
+        self._size = 0
+
+        # Holds the keys whose pair of hash values is already taken (see 
+        #   insert_entry). Its buckets are chosen by the first hash value.
+        self._overflow = ChainedHashMap(capacity, function)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for t in range(2):
+            for i in range(self._tables[t].length()):
+                out += str(t) + '.' + str(i) + ': ' + str(self._tables[t][i]) + '\n'
+        for i in range(self._stash.length()):
+            out += 'stash: ' + str(self._stash[i]) + '\n'
+        for key, value in self._overflow.items():
+            out += 'overflow: ' + str(key) + ': ' + str(value) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map (the number of buckets in each table)
+        """
+        return self._capacity
+
+    def get_table_size(self) -> int:
+        """
+        Return the number of entries in the tables and the stash, which is
+        the size without the keys in the overflow map
+        """
+        return self._size - self._overflow.get_size()
+
+    # ------------------------------------------------------------------ #
+
+    def get_index(self, hashValue: int, hashValue2: int, table: int) -> int:
+        """
+        - Returns the bucket index in the given table (0 or 1) for a key 
+            with the given hash values from the two hash functions.
+        - Both hash values and the table's seed are mixed by fmix64 before 
+            the modulus, so every bit of either hash value moves the index,
+            and the two tables' indexes are independent of each other. The
+            seeds change when the table is rehashed after a failed insert,
+            which moves keys to different buckets without calling the hash
+            functions again.
+        """
+
+        mixed = fmix64(hashValue * GOLDEN_RATIO_64 + hashValue2 + self._seeds[table])
+        return mixed % self._capacity
+
+    def put(self, key: str, value: object) -> None:
+        """
+        - Adds a key/value HashEntry object to the hash map.
+        - Steps below...
+
+        (1) Calls both hash functions once.
+        (2) If the key is already in the table (checked with find), its
+            value is replaced.
+        (3) If the load factor is at least 0.5, it calls resize_table to 
+            double the capacity.
+        (4) Calls insert_entry with a new HashEntry object, caching both 
+            hash values.
+
+        - Returns None
+        """
+
+        hashValue = self._hash_function(key)
+        hashValue2 = self._hash_function_2(key)
+
+        currHashObject = self.find(key, hashValue, hashValue2)
+        if currHashObject:
+            currHashObject.value = value
+            return
+
+        if self.table_load() >= 0.5:
+            self.resize_table(self.get_capacity() * 2)
+
+        self.insert_entry(HashEntry(key, value, hashValue, hashValue2))
+
+    def insert_entry(self, hashObject: HashEntry) -> None:
+        """
+        - Adds a HashEntry object whose key isn't in the hash map and 
+            increases the size.
+        - If shares_pair finds another key with the same two hash values
+            in the tables or the stash, the key goes to the overflow map 
+            instead, since the two keys would always compete for the same
+            two buckets.
+        - Otherwise calls place to find it a bucket. If place ends up with an entry 
+            left without a bucket, it goes in the stash, or if the stash is 
+            full, the whole table is rehashed by calling rehash, which also
+            places that entry.
+        - Raises RuntimeError (leaving the map as it was) if rehash can't 
+            fit the entries.
+        - Returns None
+        """
+
+        if self.shares_pair(hashObject):
+            self._overflow.put_hashed(hashObject.key, hashObject.value, hashObject.hash)
+            self._size += 1
+            return
+
+        homelessHashObject = self.place(hashObject)
+
+        if homelessHashObject is None:
+            self._size += 1
+        elif self._stash.length() < self._stash_size:
+            self._stash.append(homelessHashObject)
+            self._size += 1
+        else:
+            self.rehash(self.get_capacity(), homelessHashObject)
+
+    def shares_pair(self, hashObject: HashEntry) -> bool:
+        """
+        - Returns True if an entry with the same two hash values as the 
+            given HashEntry object is in the tables (where it can only be 
+            in the same two buckets) or the stash.
+        """
+
+        hashValue, hashValue2 = hashObject.hash, hashObject.step_hash
+
+        for table in range(2):
+            currHashObject = self._tables[table][self.get_index(hashValue, hashValue2, table)]
+            if (currHashObject and currHashObject.hash == hashValue
+                    and currHashObject.step_hash == hashValue2):
+                return True
+
+        for i in range(self._stash.length()):
+            currHashObject = self._stash[i]
+            if currHashObject.hash == hashValue and currHashObject.step_hash == hashValue2:
+                return True
+
+        return False
+
+    def place(self, hashObject: HashEntry) -> HashEntry:
+        """
+        - Puts a HashEntry object in one of its two buckets, without 
+            changing the size.
+        - If either bucket is empty, it goes there. Otherwise it evicts the
+            entry in its first table bucket, which then moves to its bucket 
+            in the other table, evicting that entry in turn, and so on.
+        - Returns None if every entry found a bucket. If the evictions go on 
+            for longer than max_kicks (which happens when they run in a 
+            cycle), returns the entry left without a bucket.
+        """
+
+        tables = self._tables
+        index0 = self.get_index(hashObject.hash, hashObject.step_hash, 0)
+        index1 = self.get_index(hashObject.hash, hashObject.step_hash, 1)
+
+        if tables[0][index0] is None:
+            tables[0][index0] = hashObject
+            return None
+
+        if tables[1][index1] is None:
+            tables[1][index1] = hashObject
+            return None
+
+        table = 0
+        for _ in range(self.max_kicks()):
+            index = self.get_index(hashObject.hash, hashObject.step_hash, table)
+
+            hashObject, tables[table][index] = tables[table][index], hashObject
+            if hashObject is None:
+                return None
+
+            table = 1 - table
+
+        return hashObject
+
+    def max_kicks(self) -> int:
+        """
+        - Returns the number of evictions place tries before treating the 
+            insert as a cycle, which grows with the log of the capacity.
+        """
+
+        return max(16, 6 * self.get_capacity().bit_length())
+
+    def rehash(self, new_capacity: int, extraHashObject: HashEntry = None) -> None:
+        """
+        - Rebuilds both tables at new_capacity with new seeds and places 
+            every entry in them and the stash (and extraHashObject, if 
+            given) again by calling place_all, using the hash values cached
+            on each entry. The overflow map is left as it is.
+        - If the entries don't fit with the stash holding at most 
+            stash_size of them, it starts over with new seeds, up to
+            REHASH_ATTEMPTS times, and then at double the capacity, up to
+            MAX_GROWTHS times, so the stash never grows past stash_size.
+        - Since no two of these entries have the same two hash values (see
+            insert_entry), new seeds spread them like unrelated keys, and 
+            failing every attempt is very unlikely. If it happens anyway, 
+            the map is restored as it was before the call and RuntimeError
+            is raised (extraHashObject isn't added).
+        - Returns None
+        """
+
+        entries = self.get_entries()
+        if extraHashObject:
+            entries.append(extraHashObject)
+
+        priorState = (self._tables, self._stash, self._seeds, self._capacity, self._size)
+
+        for _ in range(MAX_GROWTHS + 1):
+            for _ in range(REHASH_ATTEMPTS):
+                self._capacity = new_capacity
+                self._seeds = [fmix64(seed + table + 1)
+                               for table, seed in enumerate(self._seeds)]
+                self.clear_tables()
+
+                if self.place_all(entries):
+                    self._size = entries.length() + self._overflow.get_size()
+                    return
+
+            new_capacity *= 2
+
+        self._tables, self._stash, self._seeds, self._capacity, self._size = priorState
+        raise RuntimeError("cuckoo hashing couldn't fit these keys with any of "
+                           "the seeds and capacities tried")
+
+    def place_all(self, entries: DynamicArray) -> bool:
+        """
+        - Places every entry in the freshly cleared tables by calling place,
+            putting the entries left without a bucket in the stash.
+        - Returns False as soon as an entry doesn't fit in the stash, 
+            otherwise True.
+        """
+
+        for i in range(entries.length()):
+            homelessHashObject = self.place(entries.get_unchecked(i))
+            if homelessHashObject:
+                if self._stash.length() >= self._stash_size:
+                    return False
+                self._stash.append(homelessHashObject)
+
+        return True
+
+    def get_entries(self) -> DynamicArray:
+        """
+        - Returns a dynamic array object with every HashEntry object in 
+            both tables and the stash (not the keys in the overflow map).
+        """
+
+        entries = DynamicArray()
+
+        for table in self._tables:
+            for i in range(table.length()):
+                if table[i]:
+                    entries.append(table[i])
+
+        for i in range(self._stash.length()):
+            entries.append(self._stash[i])
+
+        return entries
+
+    def find(self, key: str, hashValue: int, hashValue2: int) -> HashEntry:
+        """
+        - Given a key and its two hash values, returns its HashEntry object,
+            or None if the key isn't in the hash map.
+        - Checks the key's bucket in the first table, then its bucket in 
+            the second table, then the stash and the overflow map if they 
+            aren't empty. The cached hash values are compared before the 
+            keys themselves.
+        - A key found in the overflow map is returned as its SLNode object,
+            which has the same key and value attributes.
+        """
+
+        currHashObject = self._tables[0][self.get_index(hashValue, hashValue2, 0)]
+        if currHashObject and currHashObject.hash == hashValue and currHashObject.key == key:
+            return currHashObject
+
+        currHashObject = self._tables[1][self.get_index(hashValue, hashValue2, 1)]
+        if currHashObject and currHashObject.hash == hashValue and currHashObject.key == key:
+            return currHashObject
+
+        for i in range(self._stash.length()):
+            currHashObject = self._stash[i]
+            if currHashObject.hash == hashValue and currHashObject.key == key:
+                return currHashObject
+
+        if self._overflow.get_size():
+            hashObject = self._overflow.get_hashed_object(hashValue)
+            if hashObject is not None:
+                return hashObject.contains(key, hashValue)
+
+        return None
+
+    def get(self, key: str) -> object:
+        """
+        - Given a key, returns the value associated with the key, or None
+            if the key isn't in the hash map.
+        """
+
+        currHashObject = self.find(key, self._hash_function(key),
+                                   self._hash_function_2(key))
+        if currHashObject is None:
+            return
+
+        return currHashObject.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        - Returns True if the key exists in the hash map, otherwise returns 
+            False.
+        """
+
+        return self.find(key, self._hash_function(key),
+                         self._hash_function_2(key)) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        - Given a key, removes the key/value from the hash map by emptying 
+            its bucket (or taking it out of the stash or the overflow map). 
+            No tombstone is needed, since a lookup never probes past a 
+            key's two buckets.
+        - Does nothing if the key doesn't exist in the hash map.
+        - Returns None
+        """
+
+        hashValue = self._hash_function(key)
+        hashValue2 = self._hash_function_2(key)
+
+        index = self.get_index(hashValue, hashValue2, 0)
+        currHashObject = self._tables[0][index]
+        if currHashObject and currHashObject.hash == hashValue and currHashObject.key == key:
+            self._tables[0][index] = None
+            self._size -= 1
+            return
+
+        index = self.get_index(hashValue, hashValue2, 1)
+        currHashObject = self._tables[1][index]
+        if currHashObject and currHashObject.hash == hashValue and currHashObject.key == key:
+            self._tables[1][index] = None
+            self._size -= 1
+            return
+
+        for i in range(self._stash.length()):
+            currHashObject = self._stash[i]
+            if currHashObject.hash == hashValue and currHashObject.key == key:
+                self._stash.swap(i, self._stash.length() - 1)
+                self._stash.pop()
+                self._size -= 1
+                return
+
+        if self._overflow.get_size() and self._overflow.contains_key(key):
+            self._overflow.remove(key)
+            self._size -= 1
+
+    def table_load(self) -> float:
+        """
+        - Returns load factor for the hash table defined as the number of 
+            entries in the tables and the stash divided by the number of 
+            buckets in both tables. The keys in the overflow map don't take
+            up any buckets, so they aren't counted.
+        """
+
+        return self.get_table_size() / (2 * self.get_capacity())
+
+    def empty_buckets(self) -> int:
+        """
+        - Returns the number of empty buckets in both tables.
+        """
+
+        return 2 * self.get_capacity() - (self.get_table_size() - self._stash.length())
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        - Changes the capacity of each table and reinserts every entry by 
+            calling rehash, using the hash values cached on each entry.
+        - If the entries would put the load factor at or above 0.5, the 
+            capacity is doubled until they fit.
+        - If new_capacity is less than 1, this method does nothing.
+        - Returns: None
+        """
+
+        if new_capacity < 1:
+            return
+
+        while self.get_table_size() / (2 * new_capacity) >= 0.5:
+            new_capacity *= 2
+
+        self.rehash(new_capacity)
+
+    def clear(self) -> None:
+        """
+        - Clears the contents of the hash map by initializing new dynamic 
+            array objects for both tables and the stash (by calling 
+            clear_tables) and clearing the overflow map. 
+        - Doesn't change the capacity.
+        - Returns: None
+        """
+
+        self.clear_tables()
+        self._overflow.clear()
+        self._size = 0
+
+    def clear_tables(self) -> None:
+        """
+        - Empties both tables and the stash, for clear and rehash, without 
+            touching the overflow map or the size.
+        - Returns: None
+        """
+
+        self._tables = (DynamicArray(), DynamicArray())
+        for table in self._tables:
+            for _ in range(self.get_capacity()):
+                table.append(None)
+
+        self._stash = DynamicArray()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        - Returns a dynamic array object with all the keys stored in the 
+            hash map.
+        """
+
+        newArray = DynamicArray()
+        entries = self.get_entries()
+
+        for i in range(entries.length()):
+            newArray.append(entries[i].key)
+
+        for key in self._overflow.keys():
+            newArray.append(key)
+
+        return newArray
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(50, hash_function_1, hash_function_2)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nget / contains_key example")
+    print("--------------------------")
+    m = HashMap(75, hash_function_2, hash_function_1)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key)) and m.get(str(key)) == key * 42
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nremove example")
+    print("--------------")
+    m = HashMap(50)
+    print(m.get('key1'))
+    m.put('key1', 10)
+    print(m.get('key1'))
+    m.remove('key1')
+    print(m.get('key1'))
+    m.remove('key4')
+
+    print("\nresize / get_keys example")
+    print("-------------------------")
+    m = HashMap(10)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    print(m.get_size(), m.get_capacity())
+    m.resize_table(1)
+    print(m.get_size(), m.get_capacity())
+    m.put('200', '2000')
+    m.remove('100')
+    keys = m.get_keys()
+    print(sorted(keys[i] for i in range(keys.length())))
+
+    print("\nstash and overflow map after a large load")
+    print("-----------------------------------------")
+    for functions in (('murmur64a', 'fnv1a'), (hash_function_1, hash_function_2)):
+        m = HashMap(50, *functions)
+        for i in range(5000):
+            m.put('str' + str(i), i)
+        print(m.get_size(), m.get_capacity(), m._stash.length() <= m._stash_size,
+              m._overflow.get_size(), all(m.get('str' + str(i)) == i for i in range(5000)))
+        for i in range(0, 5000, 2):
+            m.remove('str' + str(i))
+        print(m.get_size(), m.get_keys().length(),
+              all(m.contains_key('str' + str(i)) == (i % 2 == 1) for i in range(5000)))
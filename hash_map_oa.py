@@ -5,7 +5,9 @@
 # Due Date:     06/03/2022
 # Description:  This program makes use of a hash map (which 
 #   is built upon a dynamic array) using open addressing with 
-#   quadratic probing for collision resolution. It performs these 
+#   quadratic probing (or optionally linear probing, double hashing,
+#   Robin Hood linear probing, or triangular probing over a power of
+#   two capacity) for collision resolution. It performs these 
 #   various actions: add a key/value pair (aka put), remove a 
 #   key/value pair, clear all key/value pairs, resize the hash map, 
 #   return the value for a key (aka get), return all the keys (aka 
@@ -14,24 +16,169 @@
 #   the hash map. 
 
 
-from a6_include import (DynamicArray, HashEntry,
-                        hash_function_1, hash_function_2)
+import sys
+from math import ceil, gcd
+
+from a6_include import (DynamicArray, HashEntry, deep_sizeof,
+                        hash_function_1, hash_function_2, to_list)
+from hash_functions import get_hash_function
+
+
+def linear_probe(hashValue: int, step: int, iter: int, capacity: int) -> int:
+    """
+    - Steps one bucket at a time, which keeps a probe sequence in 
+        neighboring buckets.
+    """
+
+    return (hashValue + iter) % capacity
+
+
+def quadratic_probe(hashValue: int, step: int, iter: int, capacity: int) -> int:
+    """
+    - Adds iter squared to the hash value.
+    """
+
+    return (hashValue + iter ** 2) % capacity
+
+
+def triangular_probe(hashValue: int, step: int, iter: int, capacity: int) -> int:
+    """
+    - Adds the iter-th triangular number, iter * (iter + 1) / 2, and masks
+        with capacity - 1 in place of the modulus. With a power of two 
+        capacity, the first capacity probes visit every bucket exactly 
+        once, so put always finds a free bucket, and there's no ** or % on
+        each probe.
+    """
+
+    return (hashValue + (iter * (iter + 1) >> 1)) & (capacity - 1)
+
+
+def double_hash_probe(hashValue: int, step: int, iter: int, capacity: int) -> int:
+    """
+    - Adds iter times a step size taken from a second hash of the key (see
+        HashMap.get_probe_step), so keys that share a home bucket still 
+        follow different probe sequences.
+    """
+
+    return (hashValue + iter * step) % capacity
+
+
+# Probe strategies by name. Each takes (hashValue, step, iter, capacity)
+#   and returns the index of the iter-th bucket to try. Robin Hood 
+#   probing is built on linear probing.
+PROBE_STRATEGIES = {
+    'linear': linear_probe,
+    'quadratic': quadratic_probe,
+    'triangular': triangular_probe,
+    'double': double_hash_probe,
+    'robin_hood': linear_probe,
+}
+
+# Left in the old bucket array of an incremental resize where an entry has
+#   been moved out. It's a tombstone, so probe sequences for the keys still
+#   in the old bucket array carry on past it.
+MIGRATED = HashEntry(None, None)
+MIGRATED.is_tombstone = True
+
+
+def next_power_of_two(n: int) -> int:
+    """
+    - Returns the smallest power of two that is at least n (and at least 1).
+    """
+
+    power = 1
+    while power < n:
+        power *= 2
+    return power
+
+
+def should_compact(size: int, tombstones: int, capacity: int) -> bool:
+    """
+    - Decides how an open addressing table makes room once its load factor
+        counting tombstones reaches 0.5: returns True if it should be 
+        compacted at the same capacity, or False if its capacity should be
+        doubled. Used by this module, hash_map_compact and 
+        hash_map_ordered (where the holes in the dense arrays count as 
+        tombstones).
+    - Compacts only if tombstones take up at least an eighth of the 
+        capacity and the load factor without them (size keys) is below 
+        0.5. Clearing just a few tombstones would free just a few buckets,
+        so with the load factor just under 0.5, a remove/put workload 
+        would rehash the whole table every few puts; this way at least 
+        capacity / 8 puts separate two compactions.
+    """
+
+    return size / capacity < 0.5 and tombstones >= capacity / 8
 
 
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function,
+                 tombstone_ratio: float = 0.25,
+                 probing: str = 'quadratic',
+                 incremental_step: int = None,
+                 expected_size: int = None) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        - tombstone_ratio is the share of the capacity that tombstones may 
+            take up before the table is automatically compacted.
+        - probing selects the collision resolution: 'quadratic', or 
+            'robin_hood' for linear probing that keeps probe distances even
+            and deletes by backward shifting instead of with tombstones, 
+            'triangular', which rounds the capacity up to a power of two, 
+            'linear', or 'double' for double hashing with hash_function_2 
+            setting the step size. See PROBE_STRATEGIES.
+        - function can also be the name of a hash function registered in 
+            hash_functions.
+        - If incremental_step is given, the resizes and compactions done by
+            put and remove are incremental: the old bucket array is kept 
+            alongside the new one, and each operation moves the entries of 
+            at most incremental_step of its buckets (plus the entry for the
+            key it's given) over, instead of the whole table at once. See 
+            start_rehash. It isn't supported with Robin Hood probing, whose
+            early-exit searches and backward shift deletion rely on there 
+            being no tombstones.
+        - If expected_size is given, the capacity is raised (if needed) to
+            hold that many keys without resizing (see capacity_for), so the
+            bucket array is allocated once at its final size.
         """
-        self._buckets = DynamicArray()
-        for _ in range(capacity):
-            self._buckets.append(None)
+        if isinstance(function, str):
+            function = get_hash_function(function)
+
+        if probing not in PROBE_STRATEGIES:
+            raise ValueError(f"Unknown probing mode: {probing}")
+
+        if incremental_step is not None:
+            if incremental_step < 1:
+                raise ValueError("incremental_step must be at least 1")
+            if probing == 'robin_hood':
+                raise ValueError("incremental resizing isn't supported with "
+                                 "robin_hood probing")
+
+        if expected_size is not None:
+            capacity = max(capacity, self.capacity_for(expected_size))
+
+        if probing == 'triangular':
+            capacity = next_power_of_two(capacity)
+
+        self._buckets = DynamicArray.with_capacity(capacity)
 
         self._capacity = capacity
         self._hash_function = function
         self._size = 0
+        self._tombstones = 0
+        self._tombstone_ratio = tombstone_ratio
+        self._probing = probing
+        self._probe = PROBE_STRATEGIES[probing]
+        self._incremental_step = incremental_step
+        self._old_map = None
+        self._rehash_index = 0
+        self._migration_step = incremental_step
+
+        # Goes up whenever keys are added or removed or the bucket array is
+        #   replaced, so keys, values and items can tell if the map changed
+        #   while they were iterating over it.
+        self._version = 0
 
     def __str__(self) -> str:
         """
@@ -64,8 +211,8 @@ class HashMap:
         """ 
         - Calls the _hash_function method to determine the location in the 
             hash table.
-        - Applies the quadratic probing approach, using the parameter called
-            iter.     
+        - Applies the probing approach the map was created with (quadratic
+            by default), using the parameter called iter.     
         - If hash value exceeds the capacity of the array, the new value is 
             the current value modulus the capacity.
         - The _hash_function method Uses the hash function passed as a parameter 
@@ -73,9 +220,53 @@ class HashMap:
         - Returns an integer for the index in the array. 
         """     
         
-        hashValue = self._hash_function(key)
+        return self.get_probe_index(self._hash_function(key), iter,
+                                    self.get_probe_step(self.get_step_hash(key)))
+
+    def get_probe_index(self, hashValue: int, iter: int, step: int = 1) -> int:
+        """
+        - Same as get_hash_value, but starts from an already computed hash
+            value (such as the one cached on a HashEntry), so the hash
+            function isn't called again on every probe.
+        - step is only used by double hashing; see get_probe_step.
+        - Returns an integer for the index in the array.
+        """
+
+        return self._probe(hashValue, step, iter, self._capacity)
+
+    def get_step_hash(self, key: str) -> int:
+        """
+        - Returns the second hash of the key that double hashing takes its 
+            step size from, calculated with hash_function_2.
+        - Other probing modes don't use it, so it returns None without 
+            hashing the key.
+        """
+
+        if self._probing != 'double':
+            return None
+
+        return hash_function_2(key)
+
+    def get_probe_step(self, stepHash: int) -> int:
+        """
+        - Returns the step size double hashing uses at the current capacity,
+            given the key's second hash value.
+        - The step is between 1 and capacity - 1, and is increased until it 
+            shares no factor with the capacity, so the probe sequence visits 
+            every bucket before repeating.
+        - Other probing modes step by 1.
+        """
 
-        return (hashValue + iter ** 2) % self.get_capacity() 
+        capacity = self._capacity
+
+        if stepHash is None or capacity < 2:
+            return 1
+
+        step = 1 + stepHash % (capacity - 1)
+        while gcd(step, capacity) != 1:
+            step += 1
+
+        return step
 
     def put(self, key: str, value: object) -> None:
 
@@ -84,58 +275,188 @@ class HashMap:
             function.
         - Steps below...
 
-        (1) If the load factor is at least 0.5, it calls resize_table to double the
-            capacity and copy the prior the rehashed HashEntry objects into the 
-            larger array (without the tombstones).
-        (2) Calls HashEntry to get the new hash object.
-        (3) Initializes the insert index by calling get_hash_value with the value 
+        (1) If the load factor counting tombstones is at least 0.5, make_room
+            calls compact to clear out the tombstones without changing the 
+            capacity if they take up at least an eighth of it, or else 
+            resize_table to double the capacity and copy the prior the 
+            rehashed HashEntry objects into the larger array (without the 
+            tombstones).
+        (2) Calls the hash function once and passes the hash value to 
+            put_hashed, which does the rest of the work.
+        (3) Initializes the insert index by calling get_probe_index with the value 
             of 0 for the iter parameter. 
-        (4) If the key already exists at the location, or the key is a tombstone,
-            the new value replaces the existing value.
-        (5) Else if the location already has a key, but it's not equal to the passed 
-            key, it calls get_hash_value again, but with an iter parameter that's
+        (4) If the key already exists at the location, the new value replaces 
+            the existing value. The cached hash values are compared before the 
+            keys themselves.
+        (5) If the location is a tombstone, it's remembered (only the first 
+            one) and the search continues, since the key may still exist 
+            further along.
+        (6) Else if the location already has a key, but it's not equal to the passed 
+            key, it calls get_probe_index again, but with an iter parameter that's
             incremented by 1.
-        (6) If no empty location can be found, and the number of times we run the loop 
-            exceeds the capacity, indicating the loop is repeating, it returns None. 
-        (7) If the location is empty, it adds the HashEntry object here and increases
-            the size.
+        (7) If the number of times we run the loop exceeds the capacity, 
+            indicating the loop is repeating, the search stops. If no 
+            tombstone was found either, it returns None. 
+        (8) Calls HashEntry to get the new hash object, caching the hash value,
+            and adds it at the first tombstone found, or else at the empty 
+            location, and increases the size.
             
 
         - Returns None
         """
 
-        if self.table_load() >= 0.5:
-            self.resize_table(self.get_capacity() * 2)
+        self.put_hashed(key, value, self._hash_function(key))
+
+    def put_hashed(self, key: str, value: object, hashValue: int,
+                   stepHash: int = None) -> None:
+        """
+        - Same as put, but takes the key's hash value instead of calling
+            the hash function.
+        - With double hashing, the second hash is calculated by calling 
+            get_step_hash if stepHash isn't given.
+        - Returns None
+        """
+
+        self.make_room()
+        self.put_unchecked(key, value, hashValue, stepHash)
+
+    def make_room(self) -> None:
+        """
+        - Called before a key may be added. If the load factor counting 
+            tombstones is at least 0.5, room is made by calling compact if 
+            should_compact says so, or else by doubling the capacity.
+        - Returns None
+        """
+
+        if self.occupied_load() < 0.5:
+            return
+
+        if should_compact(self.get_size(), self._tombstones, self.get_capacity()):
+            self.compact()
+        else:
+            self.auto_resize(self.get_capacity() * 2)
+
+    def put_unchecked(self, key: str, value: object, hashValue: int,
+                      stepHash: int = None) -> None:
+        """
+        - Same as put_hashed, but without the load factor checks, so the 
+            caller must have made room already (see put_many).
+        - Calls find_slot once: if the key is found its value is replaced,
+            otherwise the new HashEntry is added at the slot find_slot
+            returned by calling insert_at.
+        - Returns None
+        """
+
+        if stepHash is None:
+            stepHash = self.get_step_hash(key)
+
+        index, found, distance = self.find_slot(key, hashValue, stepHash)
+
+        if found:
+            self._buckets.get_unchecked(index).value = value
+        elif index >= 0:
+            self.insert_at(index, HashEntry(key, value, hashValue, stepHash), distance)
+
+    def find_slot(self, key: str, hashValue: int, stepHash: int = None) -> tuple:
+        """
+        - The search part of put: given a key, its hash value and (with 
+            double hashing) its second hash, follows the probe sequence 
+            once and returns (index, found, distance).
+        - If the key is in the table, found is True and index is its 
+            bucket. Otherwise found is False and index is where the key 
+            should be added (by insert_at): the first tombstone passed, or 
+            else the empty bucket that ended the search. If the search 
+            gives up after capacity probes without either, index is -1.
+        - The cached hash values are compared before the keys themselves.
+            The capacity and probe function are looked up once, not on 
+            every probe.
+        - With Robin Hood probing, the probes are linear and also stop at 
+            an entry whose distance from its own home bucket is less than 
+            ours. An entry with the key would have displaced that entry when
+            it was inserted, so the key can't be further along, and the new
+            entry takes that bucket. distance is the new entry's distance 
+            from its home bucket there; it's 0 in the other modes.
+        - During an incremental resize, pull_from_old is called first.
+        """
+
+        if self._old_map is not None:
+            self.pull_from_old(key, hashValue)
+
+        getBucket = self._buckets.get_unchecked
+        capacity = self._capacity
+
+        if self._probing == 'robin_hood':
+            index = self.get_probe_index(hashValue, 0)
+            distance = 0
+            currHashObject = getBucket(index)
+
+            while currHashObject and currHashObject.distance >= distance:
+                if currHashObject.hash == hashValue and currHashObject.key == key:
+                    return (index, True, distance)
+
+                index = (index + 1) % capacity
+                distance += 1
+                if distance >= capacity:
+                    return (-1, False, 0)
+                currHashObject = getBucket(index)
+
+            return (index, False, distance)
+
+        step = self.get_probe_step(stepHash)
+        probe = self._probe
 
-        newHashObject = HashEntry(key, value)
-        
         iter = 0
-        index = self.get_hash_value(key, iter)
-        currHashObject = self._buckets[index]
+        index = probe(hashValue, step, iter, capacity)
+        currHashObject = getBucket(index)
 
+        tombstoneIndex = None
         loopCounter = 1
 
         while currHashObject: 
-            if currHashObject.key == key or currHashObject.is_tombstone:
-                
-                # Only increase the size for this when it's a tombstone because
-                #   we decreased the size when the key was removed earlier. 
-                if currHashObject.is_tombstone:
-                    self._size += 1
+            if currHashObject.is_tombstone:
+                if tombstoneIndex is None:
+                    tombstoneIndex = index
 
-                self._buckets[index] = newHashObject
-                return
+            elif currHashObject.hash == hashValue and currHashObject.key == key:
+                return (index, True, 0)
 
             iter += 1
-            index = self.get_hash_value(key, iter)
-            currHashObject = self._buckets[index]
+            index = probe(hashValue, step, iter, capacity)
+            currHashObject = getBucket(index)
 
             loopCounter += 1
-            if loopCounter > self.get_capacity():
-                return
+            if loopCounter > capacity:
+                break
+
+        if tombstoneIndex is not None:
+            return (tombstoneIndex, False, 0)
+        elif currHashObject:
+            return (-1, False, 0)
+
+        return (index, False, 0)
 
-        self._buckets[index] = newHashObject
+    def insert_at(self, index: int, hashObject: HashEntry, distance: int = 0) -> None:
+        """
+        - Adds a new HashEntry object at an index returned by find_slot for
+            its key, and increases the size.
+        - If that bucket holds a tombstone, it's replaced and the tombstone 
+            count goes down by 1.
+        - With Robin Hood probing, the entry's distance is set and it's 
+            placed by robin_hood_insert, which may move other entries along.
+        - Returns None
+        """
+
+        if self._probing == 'robin_hood':
+            hashObject.distance = distance
+            self.robin_hood_insert(hashObject, index)
+            return
+
+        if self._buckets.get_unchecked(index) is not None:
+            self._tombstones -= 1
+
+        self._buckets.set_unchecked(index, hashObject)
         self._size += 1
+        self._version += 1
 
     def table_load(self) -> float:
         """
@@ -145,81 +466,391 @@ class HashMap:
 
         return self.get_size() / self.get_capacity()
 
+    def occupied_load(self) -> float:
+        """
+        - Returns the share of the buckets that are not empty, defined as 
+            (size + tombstones) / capacity.
+        - Tombstones lengthen probe sequences the same as live entries, so 
+            this is what put uses to decide when to compact the table.
+        """
+
+        return (self.get_size() + self._tombstones) / self.get_capacity()
+
+    def get_tombstones(self) -> int:
+        """
+        - Returns the number of tombstones in the hash table.
+        """
+
+        return self._tombstones
+
     def empty_buckets(self) -> int:
         """
         - Returns the number of empty buckets in the hash table as defined
-            by capacity minus size.
-        - The size does not include tombstones.
+            by capacity minus size minus tombstones.
+        - The size does not include tombstones, but a tombstone still
+            occupies its bucket.
+        - Finishes any incremental resize in progress first.
+        """
+        self.finish_rehash()
+        return self.get_capacity() - self.get_size() - self._tombstones
+
+    def compact(self) -> None:
+        """
+        - Rehashes all existing key/value pairs at the same capacity, which
+            removes every tombstone from the table.
+        - Runs automatically once tombstones make up more than the 
+            tombstone_ratio share of the capacity. put (see make_room) and
+            put_many also compact instead of doubling the capacity when 
+            the load factor counting tombstones reaches 0.5, but only if 
+            tombstones take up at least an eighth of the capacity and the
+            load factor without them is below 0.5.
+        - Incremental if the map was created with an incremental_step (see
+            auto_resize).
+        - Returns: None
+        """
+
+        self.auto_resize(self.get_capacity())
+
+    def auto_resize(self, new_capacity: int) -> None:
+        """
+        - Changes the capacity for make_room and compact: by calling 
+            start_rehash if the map was created with an incremental_step, 
+            otherwise by calling resize_table.
+        - Returns None
+        """
+
+        if self._incremental_step is None:
+            self.resize_table(new_capacity)
+        else:
+            self.start_rehash(new_capacity)
+
+    def start_rehash(self, new_capacity: int) -> None:
+        """
+        - Starts an incremental resize, like Redis's progressive rehashing.
+            The current bucket array is handed to a second HashMap object 
+            (the old map), and an empty one with the new capacity takes its
+            place. The size still counts the entries in both. The entries 
+            are moved over a few at a time by the following operations:
+            (1) Every call to find_index or find_slot (which every 
+                single-key operation goes through) calls pull_from_old, 
+                which first moves the key's entry if it's still in the old
+                map, so the key can only be in the new bucket array, then 
+                calls rehash_step.
+            (2) rehash_step moves the entries of the next migration_step 
+                old buckets over, in order, and drops the old map once it 
+                reaches the end.
+        - The migration_step is the incremental_step, raised if needed so
+            the old map is always emptied before the next resize is due: 
+            after a doubling only about a quarter of the new capacity can 
+            be put before make_room resizes again, while half of it is old
+            buckets to move, so an incremental_step of 1 would leave most 
+            of the table to finish_rehash. Every operation moves at least 
+            the old capacity divided by the puts (or removes, against the 
+            tombstone_ratio) left before the next resize.
+        - An entry is moved by leaving MIGRATED (a tombstone) in its old 
+            bucket and placing it with insert_entry.
+        - Methods that loop over every bucket (get_keys, the batch methods 
+            and so on) call finish_rehash first. 
+        - A resize that's still in progress is finished first.
+        - Returns None
+        """
+
+        self.finish_rehash()
+
+        if self._probing == 'triangular':
+            new_capacity = next_power_of_two(new_capacity)
+
+        oldMap = HashMap(1, self._hash_function, self._tombstone_ratio, self._probing)
+        oldMap._buckets = self._buckets
+        oldMap._capacity = self._capacity
+        oldMap._size = self._size
+        oldMap._tombstones = self._tombstones
+
+        self._old_map = oldMap
+        self._rehash_index = 0
+
+        self._buckets = DynamicArray.with_capacity(new_capacity)
+        self._capacity = new_capacity
+        self._tombstones = 0
+        self._version += 1
+
+        headroom = min(new_capacity // 2 - self._size,
+                       int(self._tombstone_ratio * new_capacity) + 1)
+        self._migration_step = max(self._incremental_step,
+                                   ceil(oldMap.get_capacity() / max(1, headroom)))
+
+    def migrate_entry(self, index: int) -> None:
+        """
+        - Moves the entry at the given index of the old map into the new 
+            bucket array with insert_entry, leaving MIGRATED in its place.
+            Doesn't change the size.
+        - Returns None
+        """
+
+        oldMap = self._old_map
+        hashObject = oldMap._buckets.get_unchecked(index)
+
+        oldMap._buckets.set_unchecked(index, MIGRATED)
+        oldMap._size -= 1
+
+        # insert_entry counts the entry again.
+        self._size -= 1
+        self.insert_entry(hashObject)
+
+    def rehash_step(self) -> None:
+        """
+        - Moves the entries of the next migration_step buckets of the old
+            map over (see start_rehash). Once every old bucket has been 
+            visited, the old map is dropped.
+        - Returns None
+        """
+
+        getOldBucket = self._old_map._buckets.get_unchecked
+        end = min(self._rehash_index + self._migration_step,
+                  self._old_map.get_capacity())
+
+        for index in range(self._rehash_index, end):
+            hashObject = getOldBucket(index)
+            if hashObject and not hashObject.is_tombstone:
+                self.migrate_entry(index)
+
+        self._rehash_index = end
+        if end == self._old_map.get_capacity():
+            self._old_map = None
+
+    def pull_from_old(self, key: str, hashValue: int) -> None:
         """
-        return self.get_capacity() - self.get_size()
+        - Moves the key's entry over if it's still in the old map, then 
+            calls rehash_step (see start_rehash).
+        - Returns None
+        """
+
+        index = self._old_map.find_index(key, hashValue)
+        if index >= 0:
+            self.migrate_entry(index)
+
+        self.rehash_step()
+
+    def finish_rehash(self) -> None:
+        """
+        - Moves every remaining entry of the old map over, if an 
+            incremental resize is in progress.
+        - Returns None
+        """
+
+        if self._old_map is None:
+            return
+
+        getOldBucket = self._old_map._buckets.get_unchecked
+
+        for index in range(self._rehash_index, self._old_map.get_capacity()):
+            hashObject = getOldBucket(index)
+            if hashObject and not hashObject.is_tombstone:
+                self.migrate_entry(index)
+
+        self._old_map = None
 
     def resize_table(self, new_capacity: int) -> None:
         """
         - Changes the capacity and clears the current hash table, then 
             rehashes all existing key/value pairs (not including tombstones)
             before inserting each HashEntry object into the new table. 
+        - Resets the tombstone count, since none are carried over.
         - If new_capacity is less than 1, or new_capacity is less than the 
             size, this method does nothing.
+        - With triangular probing, new_capacity is rounded up to a power 
+            of two.
 
         Steps:
         (1) Make a copy of the prior hash table.
-        (2) Initialize the new capacity.  
+        (2) Initialize the new capacity. If the existing entries would put 
+            the load factor at or above 0.5, the capacity is doubled until 
+            they fit, the same as put would do while reinserting them.
         (3) Call the clear method to clear the contents of the hash map.
-        (4) Loop through each bucket in the prior table, rehashing and adding 
-            the HashEntry object to the new table (not including tombstones)
-            by calling the put method.
-
+        (4) Loop through each bucket in the prior table, moving the existing
+            HashEntry object (not including tombstones) into the new table by 
+            calling the insert_entry method. The new table is empty, so 
+            this skips put's load check, key comparison, tombstone checks 
+            and the HashEntry allocation, and the hash value cached on the 
+            entry means the hash function is never called during a resize.
+
+        - Finishes any incremental resize in progress first.
         - Returns: None
         """
+
+        self.finish_rehash()
  
         if new_capacity < 1 or new_capacity < self.get_size():
             return
 
-        priorArray = self._buckets
+        if self._probing == 'triangular':
+            new_capacity = next_power_of_two(new_capacity)
+
+        priorGet = self._buckets.get_unchecked
         priorArrayLength = self.get_capacity()
 
+        while (self.get_size() - 1) / new_capacity >= 0.5:
+            new_capacity *= 2
+
         self._capacity = new_capacity
         self.clear()
 
         for i in range(priorArrayLength):
-            priorHashObject = priorArray[i]
+            priorHashObject = priorGet(i)
             if priorHashObject and not priorHashObject.is_tombstone:
-                self.put(priorHashObject.key, priorHashObject.value)
+                self.insert_entry(priorHashObject)
+
+    def insert_entry(self, hashObject: HashEntry) -> None:
+        """
+        - Probe-only insert used by resize_table to migrate an existing
+            HashEntry object into the freshly cleared table.
+        - The table must not already contain the key, and can't contain 
+            tombstones, so the first empty location in the probe sequence 
+            is used. The cached hash values on the entry are used for 
+            probing.
+        - As in put, if no empty location can be found within capacity 
+            probes, it returns None.
+        - With Robin Hood probing, the entry's distance is reset and it's 
+            placed by robin_hood_insert instead.
+        - Returns None
+        """
+
+        if self._probing == 'robin_hood':
+            hashObject.distance = 0
+            self.robin_hood_insert(hashObject, self.get_probe_index(hashObject.hash, 0))
+            return
+
+        hashValue = hashObject.hash
+        step = self.get_probe_step(hashObject.step_hash)
+        capacity = self.get_capacity()
+        getBucket = self._buckets.get_unchecked
+        setBucket = self._buckets.set_unchecked
+
+        iter = 0
+        index = self.get_probe_index(hashValue, iter, step)
+
+        while getBucket(index) is not None:
+            iter += 1
+            if iter >= capacity:
+                return
+            index = self.get_probe_index(hashValue, iter, step)
+
+        setBucket(index, hashObject)
+        self._size += 1
                 
-    def get(self, key: str) -> int:
+    def robin_hood_insert(self, hashObject: HashEntry, index: int) -> None:
         """
-        - Given a key, returns the value associated with the key. 
-        - Calls get_hash_value repeatedly to find the location of the key.
-        - Since we may have needed to call get_hash_value several times when 
+        - Places a HashEntry object whose key isn't in the table, starting at
+            the given index with the entry's distance already set to its 
+            distance from its home bucket at that index.
+        - Whenever the entry in a bucket is closer to its home bucket than 
+            the one being placed, the two are swapped and the displaced entry
+            carries on down the table. This evens out the probe distances.
+        - Increases the size once an empty bucket is reached.
+        - Returns None
+        """
+
+        getBucket = self._buckets.get_unchecked
+        setBucket = self._buckets.set_unchecked
+        capacity = self.get_capacity()
+
+        while True:
+            currHashObject = getBucket(index)
+
+            if currHashObject is None:
+                setBucket(index, hashObject)
+                self._size += 1
+                self._version += 1
+                return
+
+            if currHashObject.distance < hashObject.distance:
+                setBucket(index, hashObject)
+                hashObject = currHashObject
+
+            index = (index + 1) % capacity
+            hashObject.distance += 1
+
+    def find_index(self, key: str, hashValue: int) -> int:
+        """
+        - Given a key and its hash value, returns the index of the bucket
+            holding the key, or -1 if the key isn't in the hash table.
+        - Calls get_probe_index repeatedly to find the location of the key.
+            The cached hash value on each HashEntry is compared before the 
+            key itself.
+        - Since we may have needed to call get_probe_index several times when 
             seeking to insert the key (each time increasing the iter value)
             to find an open location, we do the same here until we find a 
             the key.
-        - If the key is not in the hash map, as indicated by (1) the key 
-            exists in the array, but it's a tombstone or (2) the number of
-            times we run the loop equals the capacity, indicating the loop
-            is repeating or every bucket was checked, and the key doesn't 
-            exist in the array, it returns None.
+        - Tombstones are skipped, including one left behind by the same key.
+        - The key is not in the hash map, as indicated by (1) reaching an
+            empty bucket or (2) the number of times we run the loop equals 
+            the capacity, indicating the loop is repeating or every bucket 
+            was checked, and the key doesn't exist in the array.
+        - With Robin Hood probing, the search also stops at the first entry
+            that's closer to its home bucket than we are to ours (see 
+            find_slot), so a miss ends early.
+        - During an incremental resize, pull_from_old is called first.
         """
 
+        if self._old_map is not None:
+            self.pull_from_old(key, hashValue)
+
+        getBucket = self._buckets.get_unchecked
+        capacity = self.get_capacity()
+
+        if self._probing == 'robin_hood':
+            index = self.get_probe_index(hashValue, 0)
+            distance = 0
+            currHashObject = getBucket(index)
+
+            while (currHashObject and currHashObject.distance >= distance
+                   and distance < capacity):
+                if currHashObject.hash == hashValue and currHashObject.key == key:
+                    return index
+
+                index = (index + 1) % capacity
+                distance += 1
+                currHashObject = getBucket(index)
+
+            return -1
+
+        step = self.get_probe_step(self.get_step_hash(key))
+
         iter = 0
-        index = self.get_hash_value(key, iter)
-        currHashObject = self._buckets[index]
+        index = self.get_probe_index(hashValue, iter, step)
+        currHashObject = getBucket(index)
 
         loopCounter = 1
 
-        while currHashObject and loopCounter <= self.get_capacity():
+        while currHashObject and loopCounter <= capacity:
             
-            if currHashObject.key == key:
-                if currHashObject.is_tombstone:
-                    return
-                return currHashObject.value
+            if (currHashObject.hash == hashValue and currHashObject.key == key
+                    and not currHashObject.is_tombstone):
+                return index
 
             iter += 1
-            index = self.get_hash_value(key, iter)
-            currHashObject = self._buckets[index]
+            index = self.get_probe_index(hashValue, iter, step)
+            currHashObject = getBucket(index)
             
             loopCounter += 1
 
+        return -1
+
+    def get(self, key: str) -> int:
+        """
+        - Given a key, returns the value associated with the key. 
+        - Calls the hash function once, then find_index to find the 
+            location of the key.
+        - If the key is not in the hash map, it returns None.
+        """
+
+        index = self.find_index(key, self._hash_function(key))
+
+        if index < 0:
+            return
+
+        return self._buckets.get_unchecked(index).value
+
     def contains_key(self, key: str) -> bool:
         
         """
@@ -236,70 +867,441 @@ class HashMap:
     def remove(self, key: str) -> None:
         """
         - Given a key, it removes the key/value by setting it's 
-            is_tombstone value to True and reducing the size by 1.
-        - Calls get_hash_value repeatedly to find the location of the key.
-        - Since we may have needed to call get_hash_value several times when 
-            seeking to insert the key (each time increasing the iter value)
-            to find an open location, we do the same here until we find a 
-            the key.
-        - If the key is not in the hash map, as indicated by (1) the key 
-            exists in the array, but it's a tombstone or (2) the number of
-            times we run the loop equals the capacity, indicating the loop
-            is repeating or every bucket was checked, and the key doesn't 
-            exist in the array, it returns None. 
+            is_tombstone value to True, reducing the size by 1 and 
+            increasing the tombstone count by 1 (see remove_at).
+        - Calls the hash function once, then find_index to find the 
+            location of the key.
+        - If the key is not in the hash map, it returns None. 
         - Returns None. 
         """
 
-        iter = 0
-        index = self.get_hash_value(key, iter)
-        currHashObject = self._buckets[index]
+        index = self.find_index(key, self._hash_function(key))
 
-        loopCounter = 1
+        if index < 0:
+            return
 
-        while currHashObject and loopCounter <= self.get_capacity():
+        self.remove_at(index)
 
-            if currHashObject.key == key:
-                if not currHashObject.is_tombstone:
-                    self._buckets[index].is_tombstone = True
-                    self._size -= 1
-                return
-                  
-            iter += 1
-            index = self.get_hash_value(key, iter)
-            currHashObject = self._buckets[index]
+    def remove_at(self, index: int) -> None:
+        """
+        - Removes the entry at the given index (found by find_index) by 
+            turning it into a tombstone.
+        - If the tombstones then make up more than the tombstone_ratio 
+            share of the capacity, it calls compact.
+        - With Robin Hood probing, it calls robin_hood_delete instead, which
+            leaves no tombstone.
+        - Returns None
+        """
 
-            loopCounter += 1
+        if self._probing == 'robin_hood':
+            self.robin_hood_delete(index)
+            return
+
+        self._buckets.get_unchecked(index).is_tombstone = True
+        self._size -= 1
+        self._version += 1
+        self._tombstones += 1
+
+        if self._tombstones > self._tombstone_ratio * self.get_capacity():
+            self.compact()
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        - Returns the key's value if the key is in the hash map. Otherwise
+            adds the key with default as its value and returns default.
+        - Calls the hash function once and find_slot once, which returns 
+            either the key's bucket or the bucket to add it at.
+        """
+
+        hashValue = self._hash_function(key)
+        stepHash = self.get_step_hash(key)
+        self.make_room()
+
+        index, found, distance = self.find_slot(key, hashValue, stepHash)
+
+        if found:
+            return self._buckets.get_unchecked(index).value
+
+        if index >= 0:
+            self.insert_at(index, HashEntry(key, default, hashValue, stepHash), distance)
+        return default
+
+    def get_or_compute(self, key: str, factory) -> object:
+        """
+        - Same as setdefault, but the value for a missing key is computed
+            by calling factory(key), so it's only computed when it's needed.
+        - factory must not change the hash map, since the slot for the key
+            is found before it's called.
+        """
+
+        hashValue = self._hash_function(key)
+        stepHash = self.get_step_hash(key)
+        self.make_room()
+
+        index, found, distance = self.find_slot(key, hashValue, stepHash)
+
+        if found:
+            return self._buckets.get_unchecked(index).value
+
+        value = factory(key)
+        if index >= 0:
+            self.insert_at(index, HashEntry(key, value, hashValue, stepHash), distance)
+        return value
+
+    def update_with(self, key: str, function, default: object = None) -> object:
+        """
+        - Replaces the key's value with function(value), or adds the key 
+            with function(default) as its value if it's not in the hash map.
+            For example, update_with(key, lambda count: count + 1, 0) counts
+            the key, like put_mode in the separate chaining hash map.
+        - Calls the hash function once and find_slot once. function must 
+            not change the hash map.
+        - Returns the new value.
+        """
+
+        hashValue = self._hash_function(key)
+        stepHash = self.get_step_hash(key)
+        self.make_room()
+
+        index, found, distance = self.find_slot(key, hashValue, stepHash)
+
+        if found:
+            hashObject = self._buckets.get_unchecked(index)
+            hashObject.value = function(hashObject.value)
+            return hashObject.value
+
+        value = function(default)
+        if index >= 0:
+            self.insert_at(index, HashEntry(key, value, hashValue, stepHash), distance)
+        return value
+
+    def pop(self, key: str, default: object = None) -> object:
+        """
+        - Removes the key and returns its value, or returns default if the
+            key is not in the hash map.
+        - Calls the hash function once and find_index once, then removes 
+            the entry with remove_at.
+        """
+
+        index = self.find_index(key, self._hash_function(key))
+
+        if index < 0:
+            return default
+
+        value = self._buckets.get_unchecked(index).value
+        self.remove_at(index)
+        return value
+
+    def robin_hood_delete(self, index: int) -> None:
+        """
+        - Removes the entry at the given index using backward shift deletion.
+        - Each following entry that isn't in its home bucket is moved back 
+            one bucket (reducing its distance by 1), until an empty bucket 
+            or an entry in its home bucket is reached. The last bucket moved
+            from is emptied, so no tombstone is needed.
+        - Returns None
+        """
+
+        getBucket = self._buckets.get_unchecked
+        setBucket = self._buckets.set_unchecked
+        capacity = self.get_capacity()
+
+        nextIndex = (index + 1) % capacity
+        nextHashObject = getBucket(nextIndex)
+
+        while nextHashObject and nextHashObject.distance > 0:
+            nextHashObject.distance -= 1
+            setBucket(index, nextHashObject)
+
+            index = nextIndex
+            nextIndex = (index + 1) % capacity
+            nextHashObject = getBucket(nextIndex)
+
+        setBucket(index, None)
+        self._size -= 1
+        self._version += 1
+
+    def capacity_for(self, size: int) -> int:
+        """
+        - Returns the smallest capacity that holds size keys with the load 
+            factor staying below 0.5, so neither put nor put_many resizes:
+            2 * size + 1. With triangular probing, resize_table and the 
+            constructor round it up to a power of two.
+        """
+
+        return 2 * size + 1
+
+    def reserve(self, size: int) -> None:
+        """
+        - Makes room for size keys in total (including the ones already in 
+            the table): if the capacity is below capacity_for(size), 
+            resize_table is called once with that capacity, instead of the
+            table doubling repeatedly as the keys are added. It never makes
+            the table smaller.
+        - Resizes synchronously, even if the map was created with an 
+            incremental_step.
+        - Returns None
+        """
+
+        newCapacity = self.capacity_for(size)
+        if newCapacity > self.get_capacity():
+            self.resize_table(newCapacity)
+
+    @classmethod
+    def from_pairs(cls, pairs, function, **kwargs) -> "HashMap":
+        """
+        - Returns a new HashMap holding the (key, value) pairs of any 
+            iterable of pairs, such as a dynamic array of tuples or another
+            map's items(). If a key appears more than once, its last value 
+            is kept.
+        - The pairs are read into lists of keys and values first, so the 
+            map can be created with expected_size set to their number and 
+            filled by one put_many, without resizing on the way.
+        - function and any other arguments are passed to the constructor.
+        """
+
+        keys = []
+        values = []
+        for key, value in pairs:
+            keys.append(key)
+            values.append(value)
+
+        map = cls(1, function, expected_size=len(keys), **kwargs)
+        map.put_many(keys, values)
+        return map
+
+    def put_many(self, keys, values) -> None:
+        """
+        - Batch version of put. keys and values can be dynamic arrays or 
+            any other iterables, and the i-th value is stored for the i-th 
+            key. If a key appears more than once, its last value is kept.
+        - Per-call overhead is hoisted out of the loop:
+            (1) The table is resized at most once, before the batch. If 
+                the table load, counting tombstones, would reach 0.5 during
+                the batch, the capacity is doubled until the load after the
+                batch (not counting tombstones) stays below 0.5 (and at 
+                least once, unless tombstones take up an eighth of the 
+                capacity, as in make_room) and resize_table is called, 
+                which also clears the tombstones. 
+                Each put in the batch then finds the load below 0.5, as it 
+                would have after resizing on its own. Keys that are already
+                in the table (or repeated) still count towards it, so the 
+                table can end up one doubling larger than individual puts 
+                would have left it.
+            (2) All the keys are hashed in one pass (twice with double 
+                hashing) by hash_many, which uses NumPy for the sample
+                hash functions when it's installed.
+            (3) Each key is added by put_unchecked, which skips the load 
+                factor checks.
+        - Raises ValueError if keys and values have different lengths.
+        - Returns None
+        """
+
+        keys = to_list(keys)
+        values = to_list(values)
+
+        if len(keys) != len(values):
+            raise ValueError("put_many needs one value per key")
+
+        incoming = len(keys)
+        if (self.get_size() + self._tombstones + incoming) / self.get_capacity() >= 0.5:
+            newCapacity = self.get_capacity()
+            if not should_compact(self.get_size() + incoming, self._tombstones, newCapacity):
+                newCapacity *= 2
+            while (self.get_size() + incoming) / newCapacity >= 0.5:
+                newCapacity *= 2
+            self.resize_table(newCapacity)
+
+        self.finish_rehash()
+
+        # Imported here rather than at the top, so loading the module
+        #   doesn't load NumPy; only the batch methods need it.
+        from hash_functions_vectorized import hash_many
+        hashValues = hash_many(self._hash_function, keys)
+
+        if self._probing == 'double':
+            stepHashes = hash_many(hash_function_2, keys)
+        else:
+            stepHashes = [None] * incoming
+
+        putUnchecked = self.put_unchecked
+        for key, value, hashValue, stepHash in zip(keys, values, hashValues, stepHashes):
+            putUnchecked(key, value, hashValue, stepHash)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        - Batch version of get. keys can be a dynamic array or any other 
+            iterable.
+        - Returns a dynamic array with the value of each key, in the same 
+            order as keys, and None for keys that aren't in the hash table.
+        - The hash function, find_index and the bucket array are looked up
+            once. Each key is hashed as it's looked up; hashing all the keys
+            in a separate pass first (as put_many does) measured slower 
+            here, since there's no resize to do in between.
+        - Finishes any incremental resize in progress first.
+        """
+
+        self.finish_rehash()
+
+        hashFunction = self._hash_function
+        findIndex = self.find_index
+        getBucket = self._buckets.get_unchecked
+        values = []
+
+        for key in to_list(keys):
+            index = findIndex(key, hashFunction(key))
+            values.append(None if index < 0 else getBucket(index).value)
+
+        return DynamicArray(values)
+
+    def remove_many(self, keys) -> None:
+        """
+        - Batch version of remove. keys can be a dynamic array or any other
+            iterable, and keys that aren't in the hash table are skipped.
+        - All the keys are hashed in one pass by hash_many (see put_many), 
+            and the tombstone_ratio is checked once after the batch, so the
+            table is compacted at most once.
+        - Finishes any incremental resize in progress first.
+        - Returns None
+        """
+
+        self.finish_rehash()
+        keys = to_list(keys)
+
+        from hash_functions_vectorized import hash_many
+        hashValues = hash_many(self._hash_function, keys)
+
+        findIndex = self.find_index
+        getBucket = self._buckets.get_unchecked
+        robinHood = self._probing == 'robin_hood'
+
+        for key, hashValue in zip(keys, hashValues):
+            index = findIndex(key, hashValue)
+            if index < 0:
+                continue
+
+            if robinHood:
+                self.robin_hood_delete(index)
+                continue
+
+            getBucket(index).is_tombstone = True
+            self._size -= 1
+            self._version += 1
+            self._tombstones += 1
+
+        if self._tombstones > self._tombstone_ratio * self.get_capacity():
+            self.compact()
 
     def clear(self) -> None:
         """
         - Clears the contents of the hash map by initializing a new dynamic 
             array object. 
-        - Doesn't change the capacity.
+        - Doesn't change the capacity. Drops the old bucket array of an 
+            incremental resize in progress.
         - Returns: None
         """
     
-        self._buckets = DynamicArray()
-
-        for i in range(self.get_capacity()):
-            self._buckets.append(None)
+        self._buckets = DynamicArray.with_capacity(self.get_capacity())
+        self._old_map = None
 
         self._size = 0
+        self._version += 1
+        self._tombstones = 0
 
     def get_keys(self) -> DynamicArray:
         """
         - Returns a dynamic array object with all the keys stored in the 
             hash table that are not tombstones.
+        - Finishes any incremental resize in progress first.
         """
 
+        self.finish_rehash()
         newArray = DynamicArray()
+        getBucket = self._buckets.get_unchecked
 
         for i in range(self.get_capacity()):         
-            currHashObject = self._buckets[i]
+            currHashObject = getBucket(i)
             if currHashObject and not currHashObject.is_tombstone:
                 newArray.append(currHashObject.key)
 
         return newArray
 
+    def iter_entries(self):
+        """
+        - Generator over every HashEntry object in the hash table that's 
+            not a tombstone, used by keys, values and items. Nothing is 
+            copied, and nothing is allocated per key.
+        - Finishes any incremental resize in progress first (on the first 
+            next call), so every key is in the one bucket array.
+        - Raises RuntimeError if keys are added or removed, or the table is
+            resized or cleared, before the iteration is over. Changing the 
+            value of a key that's already in the table is allowed.
+        """
+
+        self.finish_rehash()
+
+        version = self._version
+        getBucket = self._buckets.get_unchecked
+
+        for i in range(self.get_capacity()):
+            currHashObject = getBucket(i)
+            if currHashObject and not currHashObject.is_tombstone:
+                yield currHashObject
+                if self._version != version:
+                    raise RuntimeError("hash map changed during iteration")
+
+    def keys(self):
+        """
+        - Returns a generator over the keys in the hash table (see 
+            iter_entries). Unlike get_keys, the keys aren't copied into a 
+            new dynamic array.
+        """
+        return (hashObject.key for hashObject in self.iter_entries())
+
+    def values(self):
+        """ - Returns a generator over the values (see iter_entries). """
+        return (hashObject.value for hashObject in self.iter_entries())
+
+    def items(self):
+        """
+        - Returns a generator over (key, value) tuples (see iter_entries), 
+            so the values don't have to be looked up again with get.
+        """
+        return ((hashObject.key, hashObject.value) for hashObject in self.iter_entries())
+
+    def memory_report(self) -> dict:
+        """
+        - Returns the memory used by the hash map in bytes, split into:
+            buckets: the dynamic array,
+            nodes: the HashEntry objects (tombstones included, since they
+                stay allocated until the next resize) and their cached hash
+                values,
+            keys and values: the keys and values, including everything 
+                they refer to,
+            total: the sum of the above.
+        - Each object is only counted once, even if it's shared.
+        - Finishes any incremental resize in progress first.
+        """
+
+        self.finish_rehash()
+        seen = set()
+        report = {'buckets': self._buckets.sizeof(), 'nodes': 0, 'keys': 0, 'values': 0}
+        getBucket = self._buckets.get_unchecked
+
+        for i in range(self.get_capacity()):
+            currHashObject = getBucket(i)
+            if currHashObject is None:
+                continue
+
+            report['nodes'] += (sys.getsizeof(currHashObject)
+                                + deep_sizeof(currHashObject.hash, seen)
+                                + deep_sizeof(currHashObject.step_hash, seen))
+            report['keys'] += deep_sizeof(currHashObject.key, seen)
+            report['values'] += deep_sizeof(currHashObject.value, seen)
+
+        report['total'] = sum(report.values())
+        return report
+
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
@@ -488,4 +1490,73 @@ if __name__ == "__main__":
     m.put('200', '2000')
     m.remove('100')
     m.resize_table(2)
-    print(m.get_keys())
\ No newline at end of file
+    print(m.get_keys())
+    print("\nprobing modes and incremental resizing against a dict")
+    print("-----------------------------------------------------")
+    import random
+
+    for probing, step in ([(probing, None) for probing in PROBE_STRATEGIES]
+                          + [('quadratic', 1), ('linear', 1), ('triangular', 1), ('double', 4)]):
+        rnd = random.Random(261)
+        m = HashMap(7, 'fnv1a', probing=probing, incremental_step=step)
+        expected = {}
+        for i in range(5000):
+            key = 'key' + str(rnd.randrange(500))
+            if rnd.random() < 0.6:
+                m.put(key, i)
+                expected[key] = i
+            else:
+                m.remove(key)
+                expected.pop(key, None)
+        print(probing, step, m.get_size() == len(expected),
+              all(m.get(key) == value for key, value in expected.items()),
+              dict(m.items()) == expected)
+
+    print("\nincremental resize example")
+    print("--------------------------")
+    m = HashMap(16, 'fnv1a', incremental_step=1)
+    for i in range(9):
+        m.put('key' + str(i), i)
+    print(m.get_capacity(), m._old_map is not None, m._migration_step)
+    print([m.get('key' + str(i)) for i in range(9)])
+    print(m._old_map is None, m.get_size())
+
+    print("\nput_many / get_many / remove_many example")
+    print("-----------------------------------------")
+    m = HashMap(10, hash_function_1)
+    m.put_many(['a', 'b', 'c', 'd'], [1, 2, 3, 4])
+    m.remove_many(['b', 'x'])
+    print(m.get_many(['a', 'b', 'c', 'd', 'x']), m.get_size())
+
+    print("\nsetdefault / get_or_compute / update_with / pop example")
+    print("-------------------------------------------------------")
+    m = HashMap(10, hash_function_1)
+    print(m.setdefault('a', 1), m.setdefault('a', 2),
+          m.get_or_compute('bb', len), m.get_or_compute('bb', str.upper),
+          m.update_with('a', lambda value: value + 10),
+          m.update_with('c', lambda value: value + 1, 0),
+          m.pop('bb'), m.pop('bb', 'missing'), m.get_size())
+
+    print("\niterators example")
+    print("-----------------")
+    m = HashMap(10, hash_function_1)
+    m.put_many(['a', 'b', 'c'], [1, 2, 3])
+    for key, value in m.items():
+        m.put(key, value * 10)
+    print(sorted(m.items()))
+    try:
+        for key in m.keys():
+            m.remove(key)
+    except RuntimeError as error:
+        print("RuntimeError:", error)
+
+    print("\nreserve / from_pairs example")
+    print("----------------------------")
+    m = HashMap(10, hash_function_1)
+    m.reserve(100)
+    capacity = m.get_capacity()
+    for i in range(100):
+        m.put(str(i), i)
+    print(capacity, m.get_capacity())
+    m = HashMap.from_pairs([(str(i), i) for i in range(100)], hash_function_1)
+    print(m.get_size(), m.get_capacity(), m.get('42'))
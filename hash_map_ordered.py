@@ -0,0 +1,435 @@
+# Description:  This program makes use of an insertion-ordered hash map
+#   using open addressing with triangular probing, laid out like CPython's
+#   compact dict: a sparse index array of slot numbers over a power of two
+#   capacity, pointing into dense entry arrays (keys, values and cached
+#   64-bit hash values) that are filled in insertion order.
+#
+#   - The index holds EMPTY, DELETED (a tombstone) or the position of the
+#       entry in the dense arrays. Its item size is the smallest that fits
+#       the capacity (1, 2, 4 or 8 bytes), so an empty bucket costs a few
+#       bytes instead of a pointer to None or a HashEntry object.
+#   - Removing a key marks its index bucket DELETED and leaves a hole
+#       (None) in the dense arrays. Once holes make up more than half the
+#       dense arrays, they're compacted.
+#   - get_keys, keys, values, items and resize_table only walk the dense
+#       arrays, so they cost O(size) (plus allocating the new index on a
+#       resize) however sparse the index is, and return the keys in the
+#       order they were first added.
+#
+#   It supports the same actions as the open addressing hash map: put,
+#   get, remove, contains_key, clear, resize, get_keys, empty_buckets and
+#   table_load. Keys are strings (None marks a hole).
+
+
+import sys
+from array import array
+
+from a6_include import DynamicArray, deep_sizeof
+from hash_functions import get_hash_function
+from hash_map_oa import next_power_of_two, should_compact
+
+
+# Index values for buckets that don't point to an entry.
+EMPTY = -1
+DELETED = -2
+
+# Hash values are stored in a signed 64-bit array, so they're cut down to
+#   63 bits (which also makes negative hash values positive).
+HASH_MASK = (1 << 63) - 1
+
+
+def index_typecode(capacity: int) -> str:
+    """
+    - Returns the array typecode with the smallest item size that can hold
+        every entry position for the capacity (and EMPTY and DELETED).
+    """
+
+    if capacity <= 0x7F:
+        return 'b'
+    if capacity <= 0x7FFF:
+        return 'h'
+    if capacity <= 0x7FFFFFFF:
+        return 'i'
+    return 'q'
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new insertion-ordered HashMap that uses
+        triangular probing over a sparse index into dense entry arrays
+        - The capacity (the number of index buckets) is rounded up to a
+            power of two.
+        - function can also be the name of a hash function registered in
+            hash_functions.
+        """
+        if isinstance(function, str):
+            function = get_hash_function(function)
+
+        self._capacity = next_power_of_two(capacity)
+        self._hash_function = function
+
+        # Goes up whenever keys are added or removed or the arrays are
+        #   rebuilt, so keys, values and items can tell if the map changed
+        #   while they were iterating over it.
+        self._version = 0
+        self.clear()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(len(self._keys)):
+            if self._keys[i] is not None:
+                out += str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i]) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def get_hash(self, key: str) -> int:
+        """
+        - Calls the hash function and returns the hash value cut down to 63
+            bits, which is what the hashes array stores.
+        """
+
+        return self._hash_function(key) & HASH_MASK
+
+    def find_slot(self, key: str, hashValue: int) -> tuple:
+        """
+        - Given a key and its (63-bit) hash value, follows the probe
+            sequence through the index and returns (bucket, position).
+        - If the key is in the table, position is its place in the dense
+            arrays and bucket is the index bucket pointing to it. Otherwise
+            position is -1 and bucket is where the key should be added: the
+            first DELETED bucket passed, or else the empty bucket that ended
+            the search.
+        - Only the index and hashes arrays are read until a cached hash
+            matches.
+        """
+
+        indices = self._indices
+        hashes = self._hashes
+        mask = self._capacity - 1
+
+        bucket = hashValue & mask
+        deletedBucket = -1
+
+        for iter in range(1, self._capacity + 1):
+            position = indices[bucket]
+
+            if position == EMPTY:
+                break
+
+            if position == DELETED:
+                if deletedBucket < 0:
+                    deletedBucket = bucket
+            elif hashes[position] == hashValue and self._keys[position] == key:
+                return (bucket, position)
+
+            bucket = (bucket + iter) & mask
+
+        if deletedBucket >= 0:
+            bucket = deletedBucket
+
+        return (bucket, -1)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        - Adds a key/value pair to the location determined by the hash
+            function.
+        - Steps below...
+
+        (1) Calls find_slot. If the key is already in the table, its value
+            is replaced, which doesn't change its place in the order.
+        (2) Otherwise, if adding an entry would put the load factor counting
+            holes (the length of the dense arrays over the capacity) at 0.5
+            or more, compact is called if hash_map_oa's should_compact says
+            so (with the holes as the tombstones), or else resize_table 
+            doubles the capacity. find_slot is then called again.
+        (3) The key, value and hash value are appended to the dense arrays,
+            and the index bucket is pointed at them. A DELETED bucket that's
+            reused this way no longer counts as a tombstone.
+
+        - Returns None
+        """
+
+        hashValue = self.get_hash(key)
+        bucket, position = self.find_slot(key, hashValue)
+
+        if position >= 0:
+            self._values[position] = value
+            return
+
+        if (len(self._keys) + 1) / self._capacity >= 0.5:
+            holes = len(self._keys) - self._size
+            if should_compact(self._size + 1, holes, self._capacity):
+                self.compact()
+            else:
+                self.resize_table(self._capacity * 2)
+            bucket, position = self.find_slot(key, hashValue)
+
+        if self._indices[bucket] == DELETED:
+            self._tombstones -= 1
+
+        self._indices[bucket] = len(self._keys)
+        self._keys.append(key)
+        self._values.append(value)
+        self._hashes.append(hashValue)
+        self._size += 1
+        self._version += 1
+
+    def get(self, key: str) -> object:
+        """
+        - Given a key, returns the value associated with the key, or None
+            if the key isn't in the hash map.
+        """
+
+        position = self.find_slot(key, self.get_hash(key))[1]
+
+        if position < 0:
+            return
+
+        return self._values[position]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        - Returns True if the key exists in the hash map, otherwise returns
+            False.
+        """
+
+        return self.find_slot(key, self.get_hash(key))[1] >= 0
+
+    def remove(self, key: str) -> None:
+        """
+        - Given a key, marks its index bucket DELETED and releases the key
+            and value, leaving a hole in the dense arrays.
+        - If holes then make up more than half the dense arrays, it calls
+            compact, so walking the dense arrays stays O(size).
+        - Does nothing if the key doesn't exist in the hash map.
+        - Returns None
+        """
+
+        bucket, position = self.find_slot(key, self.get_hash(key))
+
+        if position < 0:
+            return
+
+        self._indices[bucket] = DELETED
+        self._keys[position] = None
+        self._values[position] = None
+        self._size -= 1
+        self._tombstones += 1
+        self._version += 1
+
+        if len(self._keys) - self._size > self._size:
+            self.compact()
+
+    def table_load(self) -> float:
+        """
+        - Returns load factor for the hash table defined as size / capacity.
+        - The size does not include tombstones.
+        """
+
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        - Returns the number of empty index buckets, defined as capacity
+            minus size minus tombstones.
+        """
+
+        return self._capacity - self._size - self._tombstones
+
+    def compact(self) -> None:
+        """
+        - Rebuilds the dense arrays without holes, and the index without
+            tombstones, at the same capacity.
+        - Returns: None
+        """
+
+        self.resize_table(self._capacity)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        - Changes the capacity (rounded up to a power of two), rebuilding
+            the dense arrays without holes (keeping the insertion order) and
+            a new index for them, probing with the cached hash values, so
+            the hash function is never called during a resize.
+        - Only the dense arrays are walked, not the old index, so apart from
+            allocating the new index it's O(size).
+        - If the existing entries would put the load factor at or above
+            0.5, the capacity is doubled until they fit.
+        - If new_capacity is less than 1, or new_capacity is less than the
+            size, this method does nothing.
+        - Returns: None
+        """
+
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+
+        new_capacity = next_power_of_two(new_capacity)
+        while self._size / new_capacity >= 0.5:
+            new_capacity *= 2
+
+        priorKeys = self._keys
+        priorValues = self._values
+        priorHashes = self._hashes
+
+        self._capacity = new_capacity
+        self.clear()
+
+        indices = self._indices
+        keys = self._keys
+        values = self._values
+        hashes = self._hashes
+        mask = new_capacity - 1
+
+        for i in range(len(priorKeys)):
+            key = priorKeys[i]
+            if key is None:
+                continue
+
+            hashValue = priorHashes[i]
+            bucket = hashValue & mask
+            iter = 1
+            while indices[bucket] != EMPTY:
+                bucket = (bucket + iter) & mask
+                iter += 1
+
+            indices[bucket] = len(keys)
+            keys.append(key)
+            values.append(priorValues[i])
+            hashes.append(hashValue)
+
+        self._size = len(keys)
+
+    def clear(self) -> None:
+        """
+        - Clears the contents of the hash map by allocating a new index and
+            new, empty dense arrays.
+        - Doesn't change the capacity.
+        - Returns: None
+        """
+
+        self._indices = array(index_typecode(self._capacity), [EMPTY]) * self._capacity
+        self._keys = []
+        self._values = []
+        self._hashes = array('q')
+        self._size = 0
+        self._tombstones = 0
+        self._version += 1
+
+    def get_keys(self) -> DynamicArray:
+        """
+        - Returns a dynamic array object with all the keys stored in the
+            hash table, in insertion order.
+        - Only the dense keys array is read, so it's O(size).
+        """
+
+        return DynamicArray([key for key in self._keys if key is not None])
+
+    def iter_positions(self):
+        """
+        - Generator over the position of every entry in the dense arrays,
+            in insertion order, used by keys, values and items.
+        - Raises RuntimeError if keys are added or removed, or the table is
+            resized or cleared, before the iteration is over. Changing the
+            value of a key that's already in the table is allowed.
+        """
+
+        version = self._version
+        keys = self._keys
+
+        for position in range(len(keys)):
+            if keys[position] is not None:
+                yield position
+                if self._version != version:
+                    raise RuntimeError("hash map changed during iteration")
+
+    def keys(self):
+        """ - Returns a generator over the keys, in insertion order. """
+        keys = self._keys
+        return (keys[position] for position in self.iter_positions())
+
+    def values(self):
+        """ - Returns a generator over the values, in insertion order. """
+        values = self._values
+        return (values[position] for position in self.iter_positions())
+
+    def items(self):
+        """
+        - Returns a generator over (key, value) tuples, in insertion order.
+        """
+        keys = self._keys
+        values = self._values
+        return ((keys[position], values[position]) for position in self.iter_positions())
+
+    def memory_report(self) -> dict:
+        """
+        - Returns the memory used by the hash map in bytes, split into:
+            buckets: the index array,
+            nodes: the dense arrays (holes included) and the cached hash
+                values,
+            keys and values: the keys and values, including everything
+                they refer to,
+            total: the sum of the above.
+        - Each object is only counted once, even if it's shared.
+        """
+
+        seen = set()
+        report = {
+            'buckets': sys.getsizeof(self._indices),
+            'nodes': (sys.getsizeof(self._keys) + sys.getsizeof(self._values)
+                      + sys.getsizeof(self._hashes)),
+            'keys': 0,
+            'values': 0,
+        }
+
+        for position in self.iter_positions():
+            report['keys'] += deep_sizeof(self._keys[position], seen)
+            report['values'] += deep_sizeof(self._values[position], seen)
+
+        report['total'] = sum(report.values())
+        return report
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput / remove example")
+    print("--------------------")
+    m = HashMap(8, 'fnv1a')
+    for word in ("pear", "apple", "fig", "kiwi", "plum", "lime"):
+        m.put(word, len(word))
+    m.remove('fig')
+    m.put('apple', 50)
+    m.put('fig', 3)
+    print(m.get_size(), m.get_capacity(), m.get('apple'), m.contains_key('kiwi'))
+    print(m.get_keys())
+    print(list(m.items()))
+
+    print("\nsparse table example")
+    print("--------------------")
+    m = HashMap(8, 'fnv1a')
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    for i in range(990):
+        m.remove('key' + str(i))
+    print(m.get_size(), m.get_capacity(), len(m._keys))
+    print(list(m.keys()))
+    m.resize_table(1)
+    print(m.get_size(), m.get_capacity(), m.empty_buckets())
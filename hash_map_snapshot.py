@@ -0,0 +1,431 @@
+# Description:  A binary snapshot format for the open addressing hash map
+#   (hash_map_oa), and a read-only map that answers get and contains_key
+#   straight from a memory-mapped snapshot file, so a large map can be
+#   opened in milliseconds instead of being rebuilt with put.
+#
+#   save_snapshot writes the map's bucket layout as it is, bucket for
+#   bucket, so SnapshotMap can follow the same probe sequences without
+#   rehashing anything. The file is made of a header and parallel arrays
+#   with one item per bucket, each starting on an 8-byte boundary:
+#
+#   - header: see HEADER below. It records the probing mode, capacity,
+#       size and the name of the hash function (from hash_functions'
+#       registry), which must be the one used to look keys up.
+#   - states: 1 byte per bucket, EMPTY, FULL or TOMBSTONE.
+#   - kinds: 1 byte per bucket, the type of the value (see VALUE_KINDS).
+#   - hashes: the cached hash of each key, cut down to 64 bits.
+#   - key offsets and key lengths, value offsets and value lengths: where
+#       each key and value is in the heap.
+#   - heap: the keys (UTF-8) and values (UTF-8 for strings, decimal text
+#       for ints and floats, raw bytes for bytes), one after another.
+#
+#   SnapshotMap maps the file read-only with mmap and reads the arrays
+#   through memoryviews cast to their item types, so opening a snapshot
+#   reads nothing but the header, the pages of a bucket are only read
+#   when a lookup probes them, and processes that open the same file
+#   share its pages in the page cache. A lookup hashes the key, probes
+#   the states and hashes arrays, and only compares key bytes (without
+#   copying them) once a cached hash matches. Only the value returned is
+#   copied out of the file.
+#
+#   The arrays are in the machine's native byte order, which the header
+#   records; a snapshot can only be opened on a machine with the same one.
+
+
+import mmap
+import os
+import struct
+from array import array
+from math import gcd
+
+from a6_include import DynamicArray, hash_function_2
+from hash_functions import HASH_FUNCTIONS, get_hash_function
+from hash_map_oa import PROBE_STRATEGIES
+
+
+MAGIC = b'HMAPSNAP'
+FORMAT_VERSION = 1
+
+# Read back as this value only if the file has the native byte order.
+BYTE_ORDER_MARK = 0x01020304
+
+# magic, format version, byte order mark, probing mode (an index into
+#   PROBING_MODES), padding, capacity, size, heap size, hash function name.
+HEADER = struct.Struct('=8sIIIIQQQ32s')
+
+PROBING_MODES = ('linear', 'quadratic', 'triangular', 'double', 'robin_hood')
+
+# Bucket states.
+EMPTY = 0
+FULL = 1
+TOMBSTONE = 2
+
+# Value types, and the type stored under each kind.
+NONE = 0
+STR = 1
+INT = 2
+FLOAT = 3
+BYTES = 4
+BOOL = 5
+
+VALUE_KINDS = {
+    type(None): NONE,
+    str: STR,
+    int: INT,
+    float: FLOAT,
+    bytes: BYTES,
+    bool: BOOL,
+}
+
+HASH_MASK = (1 << 64) - 1
+
+
+def align(offset: int) -> int:
+    """ Return offset rounded up to a multiple of 8. """
+    return (offset + 7) & ~7
+
+
+def section_layout(capacity: int) -> dict:
+    """
+    - Returns the (start, item type) of each per-bucket array for the
+        capacity, with the starts as byte offsets from the beginning of the
+        file, and the start of the heap under 'heap'. Used by both
+        save_snapshot and SnapshotMap, so they always agree.
+    """
+
+    layout = {}
+    offset = align(HEADER.size)
+
+    for name, typecode in (('states', 'B'), ('kinds', 'B'), ('hashes', 'Q'),
+                           ('key_offsets', 'Q'), ('key_lengths', 'I'),
+                           ('value_offsets', 'Q'), ('value_lengths', 'I')):
+        layout[name] = (offset, typecode)
+        offset = align(offset + capacity * array(typecode).itemsize)
+
+    layout['heap'] = (offset, 'B')
+    return layout
+
+
+def encode_value(value: object) -> tuple:
+    """
+    - Returns the kind of the value and its bytes for the heap.
+    - Raises TypeError for values of any other type than those in
+        VALUE_KINDS.
+    """
+
+    kind = VALUE_KINDS.get(type(value))
+
+    if kind is None:
+        raise TypeError(f"Can't store a value of type {type(value).__name__} in a snapshot")
+
+    if kind == NONE:
+        return (kind, b'')
+    if kind == STR:
+        return (kind, value.encode('utf-8', 'surrogatepass'))
+    if kind == BYTES:
+        return (kind, value)
+    if kind == FLOAT:
+        return (kind, repr(value).encode('ascii'))
+
+    return (kind, str(int(value)).encode('ascii'))
+
+
+def decode_value(kind: int, data) -> object:
+    """ The reverse of encode_value, given the value's heap bytes. """
+
+    if kind == NONE:
+        return None
+    if kind == STR:
+        return str(data, 'utf-8', 'surrogatepass')
+    if kind == BYTES:
+        return bytes(data)
+    if kind == FLOAT:
+        return float(bytes(data))
+    if kind == BOOL:
+        return bytes(data) == b'1'
+
+    return int(bytes(data))
+
+
+def save_snapshot(map, path: str) -> None:
+    """
+    - Writes a hash_map_oa.HashMap to a snapshot file at path.
+    - Finishes any incremental resize in progress first. Tombstones are
+        kept, since probe sequences run past them.
+    - The keys must be strings, the values of a type in VALUE_KINDS, and
+        the map's hash function one of those registered by name in
+        hash_functions.HASH_FUNCTIONS, so that SnapshotMap can hash keys
+        the same way (raises TypeError or ValueError otherwise).
+    - The file is written next to path and then renamed over it, so a
+        process that opens path always sees a complete snapshot.
+    - Returns None
+    """
+
+    functionName = None
+    for name, function in HASH_FUNCTIONS.items():
+        if function is map._hash_function:
+            functionName = name
+
+    if functionName is None:
+        raise ValueError("The map's hash function isn't registered in hash_functions")
+
+    map.finish_rehash()
+
+    capacity = map.get_capacity()
+    layout = section_layout(capacity)
+
+    states = bytearray(capacity)
+    kinds = bytearray(capacity)
+    arrays = {name: array(layout[name][1], bytes(capacity * array(layout[name][1]).itemsize))
+              for name in ('hashes', 'key_offsets', 'key_lengths',
+                           'value_offsets', 'value_lengths')}
+    heap = bytearray()
+    getBucket = map._buckets.get_unchecked
+
+    for i in range(capacity):
+        hashObject = getBucket(i)
+        if hashObject is None:
+            continue
+
+        if hashObject.is_tombstone:
+            states[i] = TOMBSTONE
+            continue
+
+        if type(hashObject.key) is not str:
+            raise TypeError("Snapshot keys must be strings")
+
+        keyBytes = hashObject.key.encode('utf-8', 'surrogatepass')
+        kind, valueBytes = encode_value(hashObject.value)
+
+        states[i] = FULL
+        kinds[i] = kind
+        arrays['hashes'][i] = hashObject.hash & HASH_MASK
+        arrays['key_offsets'][i] = len(heap)
+        arrays['key_lengths'][i] = len(keyBytes)
+        heap += keyBytes
+        arrays['value_offsets'][i] = len(heap)
+        arrays['value_lengths'][i] = len(valueBytes)
+        heap += valueBytes
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER_MARK,
+                         PROBING_MODES.index(map._probing), 0, capacity,
+                         map.get_size(), len(heap), functionName.encode('ascii'))
+
+    sections = {'states': states, 'kinds': kinds, 'heap': heap}
+    sections.update(arrays)
+
+    tempPath = path + '.tmp'
+    with open(tempPath, 'wb') as file:
+        file.write(header)
+        for name, (start, typecode) in sorted(layout.items(), key=lambda item: item[1][0]):
+            file.write(bytes(start - file.tell()))
+            file.write(sections[name])
+
+    os.replace(tempPath, path)
+
+
+class SnapshotMap:
+    def __init__(self, path: str, function=None) -> None:
+        """
+        Open a snapshot file written by save_snapshot as a read-only map.
+        - The file is mapped with mmap, and only the header is read here.
+        - function overrides the hash function named in the header, for
+            a function registered under another name in this process. It
+            must return the same hashes.
+        - Raises ValueError if the file isn't a snapshot, or was written
+            with another format version or byte order.
+        """
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a hash map snapshot")
+
+        (magic, version, byteOrderMark, probing, _, capacity, size, heapSize,
+         functionName) = HEADER.unpack_from(self._mmap, 0)
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} hash map snapshot")
+
+        if byteOrderMark != BYTE_ORDER_MARK:
+            self._mmap.close()
+            raise ValueError(f"{path} was written on a machine with another byte order")
+
+        if function is None:
+            function = get_hash_function(functionName.rstrip(b'\0').decode('ascii'))
+
+        self._hash_function = function
+        self._probing = PROBING_MODES[probing]
+        self._probe = PROBE_STRATEGIES[self._probing]
+        self._capacity = capacity
+        self._size = size
+
+        # One memoryview per array, cast to its item type, over the mapped
+        #   file. Nothing is copied.
+        self._view = memoryview(self._mmap)
+        layout = section_layout(capacity)
+        for name in ('states', 'kinds', 'hashes', 'key_offsets', 'key_lengths',
+                     'value_offsets', 'value_lengths'):
+            start, typecode = layout[name]
+            length = capacity * array(typecode).itemsize
+            setattr(self, '_' + name, self._view[start:start + length].cast(typecode))
+
+        heapStart = layout['heap'][0]
+        self._heap = self._view[heapStart:heapStart + heapSize]
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_probe_step(self, key: str) -> int:
+        """
+        - Same as hash_map_oa.HashMap.get_probe_step (for the key's second
+            hash): the step size for double hashing, or 1 for the other
+            probing modes.
+        """
+
+        capacity = self._capacity
+
+        if self._probing != 'double' or capacity < 2:
+            return 1
+
+        step = 1 + hash_function_2(key) % (capacity - 1)
+        while gcd(step, capacity) != 1:
+            step += 1
+
+        return step
+
+    def find_index(self, key: str) -> int:
+        """
+        - Returns the index of the bucket holding the key, or -1 if the key
+            isn't in the snapshot.
+        - Follows the same probe sequence as hash_map_oa.HashMap.find_index,
+            reading only the states and hashes arrays until a cached hash
+            matches. The key itself is then compared with its bytes in the
+            heap, without copying them.
+        """
+
+        if self._capacity == 0:
+            return -1
+
+        hashValue = self._hash_function(key)
+        maskedHash = hashValue & HASH_MASK
+        step = self.get_probe_step(key)
+        probe = self._probe
+        capacity = self._capacity
+        states = self._states
+        hashes = self._hashes
+        keyBytes = None
+
+        for iter in range(capacity):
+            index = probe(hashValue, step, iter, capacity)
+            state = states[index]
+
+            if state == EMPTY:
+                return -1
+
+            if state == FULL and hashes[index] == maskedHash:
+                if keyBytes is None:
+                    keyBytes = key.encode('utf-8', 'surrogatepass')
+                start = self._key_offsets[index]
+                if self._heap[start:start + self._key_lengths[index]] == keyBytes:
+                    return index
+
+        return -1
+
+    def read_value(self, index: int) -> object:
+        """ Return the value in the bucket at index, copied from the heap. """
+
+        start = self._value_offsets[index]
+        data = self._heap[start:start + self._value_lengths[index]]
+        return decode_value(self._kinds[index], data)
+
+    def get(self, key: str) -> object:
+        """
+        - Given a key, returns the value associated with the key, or None
+            if the key isn't in the snapshot.
+        """
+
+        index = self.find_index(key)
+
+        if index < 0:
+            return
+
+        return self.read_value(index)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        - Returns True if the key exists in the snapshot, otherwise returns
+            False.
+        """
+
+        return self.find_index(key) >= 0
+
+    def keys(self):
+        """ - Returns a generator over the keys, in bucket order. """
+
+        states = self._states
+        for index in range(self._capacity):
+            if states[index] == FULL:
+                start = self._key_offsets[index]
+                yield str(self._heap[start:start + self._key_lengths[index]],
+                          'utf-8', 'surrogatepass')
+
+    def get_keys(self) -> DynamicArray:
+        """
+        - Returns a dynamic array object with all the keys in the snapshot.
+        """
+
+        return DynamicArray(list(self.keys()))
+
+    def close(self) -> None:
+        """
+        - Releases the memoryviews and unmaps the file. The map can't be
+            used afterwards.
+        - Returns None
+        """
+
+        for name in ('states', 'kinds', 'hashes', 'key_offsets', 'key_lengths',
+                     'value_offsets', 'value_lengths', 'heap'):
+            getattr(self, '_' + name).release()
+
+        self._view.release()
+        self._mmap.close()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    from hash_map_oa import HashMap
+
+    print("\nsave / open example")
+    print("-------------------")
+    m = HashMap(16, 'fnv1a', probing='double')
+    for word in ("pear", "apple", "fig", "kiwi", "plum"):
+        m.put(word, len(word))
+    m.put('name', 'snapshot')
+    m.put('ratio', 0.5)
+    m.remove('fig')
+
+    path = os.path.join(tempfile.mkdtemp(), 'map.snapshot')
+    save_snapshot(m, path)
+
+    snapshot = SnapshotMap(path)
+    print(snapshot.get_size(), snapshot.get_capacity())
+    print(snapshot.get('apple'), snapshot.get('name'), snapshot.get('ratio'), snapshot.get('fig'))
+    print(snapshot.contains_key('kiwi'), snapshot.contains_key('fig'))
+    print(sorted(snapshot.keys()))
+    snapshot.close()